@@ -0,0 +1,7 @@
+"""
+Campus Events - code shared by the scraper/ engine and the scraper2/ Greek Theatre scraper
+
+    dates            date/time tokenizing and per-source format learning
+    identity         event keys and fingerprints (the upsert key of the events table)
+    local_postgrest  in-process SQLite stand-in for the Supabase client
+"""
@@ -0,0 +1,189 @@
+"""
+Batch date/time normalization for scraped events.
+Turns raw date strings into TIMESTAMP format 'YYYY-MM-DD HH:MM:SS'.
+"""
+
+import calendar
+import re
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+# strptime formats a source may use consistently; the first one that fits a
+# source is remembered and tried first for every later string from it
+DATE_FORMATS = [
+    "%B %d, %Y %I:%M %p",   # May 3, 2026 7:00 pm
+    "%b %d, %Y %I:%M %p",   # May 3, 2026 7:00 pm (abbreviated month)
+    "%Y-%m-%d %H:%M:%S",    # 2026-05-03 19:00:00
+    "%Y-%m-%dT%H:%M:%S",    # 2026-05-03T19:00:00
+    "%B %d, %Y",            # January 15, 2024
+    "%b %d, %Y",            # Jan 15, 2024
+    "%m/%d/%Y",             # 01/15/2024
+    "%Y-%m-%d",             # 2024-01-15
+    "%d %B %Y",             # 15 January 2024
+    "%d %b %Y",             # 15 Jan 2024
+    "%B %d %Y",             # January 15 2024
+    "%b %d %Y",             # Jan 15 2024
+]
+
+MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+MONTHS.update({name.lower(): number for number, name in enumerate(calendar.month_abbr) if name})
+MONTHS['sept'] = 9
+
+# Regex fallback covering the same shapes as DATE_FORMATS (and a few more)
+# without raising an exception per attempted format
+DATE_PATTERN = re.compile(r"""
+    ^\s*(?:
+        (?P<month_name>[a-z]+)\.?\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<year>\d{4})
+      | (?P<day2>\d{1,2})\s+(?P<month_name2>[a-z]+)\.?,?\s+(?P<year2>\d{4})
+      | (?P<month3>\d{1,2})/(?P<day3>\d{1,2})/(?P<year3>\d{4})
+      | (?P<year4>\d{4})-(?P<month4>\d{1,2})-(?P<day4>\d{1,2})
+    )
+    (?:[\sT,@]+(?P<time>.*?))?\s*$
+""", re.I | re.X)
+TIME_PATTERN = re.compile(r'^(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?(?::\d{2})?\s*(?:(?P<ampm>[ap])\.?m?\.?)?$', re.I)
+
+# Time used when a string carries no time of day
+DEFAULT_TIME = (19, 0)
+
+
+class NormalizedDates(NamedTuple):
+    """Result of a batch: one value per input (None if unparsed) plus the failures."""
+    values: List[Optional[str]]
+    failures: List[Tuple[int, str]]
+
+
+def parse_time(time_str: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse a time of day such as "7:00 PM", "7 pm" or "19:00".
+
+    Returns:
+        (hour, minute) in 24-hour time, or None if unrecognized
+    """
+    match = TIME_PATTERN.match(time_str.strip())
+    if not match:
+        return None
+    hour = int(match.group('hour'))
+    minute = int(match.group('minute') or 0)
+    ampm = (match.group('ampm') or '').lower()
+    if ampm == 'p' and hour != 12:
+        hour += 12
+    elif ampm == 'a' and hour == 12:
+        hour = 0
+    if hour > 23 or minute > 59:
+        return None
+    return hour, minute
+
+
+def tokenize_date(raw: str, default_time: Tuple[int, int] = DEFAULT_TIME) -> Optional[str]:
+    """
+    Parse a date (with optional time) using the precompiled regex.
+
+    Returns:
+        Timestamp string, or None if the string is not a recognizable date
+    """
+    match = DATE_PATTERN.match(raw)
+    if not match:
+        return None
+    groups = match.groupdict()
+
+    if groups['month_name'] or groups['month_name2']:
+        month = MONTHS.get((groups['month_name'] or groups['month_name2']).lower())
+        day = groups['day'] or groups['day2']
+        year = groups['year'] or groups['year2']
+    else:
+        month = int(groups['month3'] or groups['month4'])
+        day = groups['day3'] or groups['day4']
+        year = groups['year3'] or groups['year4']
+    if not month or not 1 <= month <= 12:
+        return None
+    year, day = int(year), int(day)
+    if not 1 <= day <= calendar.monthrange(year, month)[1]:
+        return None
+
+    hour, minute = default_time
+    if groups['time']:
+        parsed_time = parse_time(groups['time'])
+        if parsed_time is None:
+            return None
+        hour, minute = parsed_time
+
+    return f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:00"
+
+
+def _has_time(fmt: str) -> bool:
+    return '%H' in fmt or '%I' in fmt
+
+
+class DateNormalizer:
+    """
+    Normalizes batches of raw date strings, learning each source's format.
+
+    The learned strptime format is tried first for every string from that
+    source; strings it does not fit go through the regex tokenizer.
+    Unparseable strings are returned as failures instead of being dropped.
+    """
+
+    def __init__(self):
+        self._formats: Dict[str, Optional[str]] = {}
+
+    def learned_format(self, source: str) -> Optional[str]:
+        """Return the format remembered for a source, if any."""
+        return self._formats.get(source)
+
+    def normalize_batch(self, raw_values: List[Optional[str]], source: str,
+                        default_time: Tuple[int, int] = DEFAULT_TIME) -> NormalizedDates:
+        """
+        Normalize a list of raw date strings from one source.
+
+        Args:
+            raw_values: Raw strings (None or empty entries count as failures)
+            source: Source identifier the format is learned for
+            default_time: (hour, minute) used when a string has no time
+
+        Returns:
+            NormalizedDates with one value per input and (index, raw) failures
+        """
+        fmt = self._formats.get(source)
+        values: List[Optional[str]] = []
+        failures: List[Tuple[int, str]] = []
+
+        for index, raw in enumerate(raw_values):
+            raw = (raw or '').strip()
+            value = None
+            if raw and fmt:
+                try:
+                    parsed = datetime.strptime(raw, fmt)
+                    if not _has_time(fmt):
+                        parsed = parsed.replace(hour=default_time[0], minute=default_time[1])
+                    value = parsed.strftime("%Y-%m-%d %H:%M:%S")
+                except ValueError:
+                    pass
+            if value is None and raw:
+                value = tokenize_date(raw, default_time)
+                if value is not None and source not in self._formats:
+                    fmt = self._learn(source, raw)
+            if value is None:
+                failures.append((index, raw))
+            values.append(value)
+
+        return NormalizedDates(values, failures)
+
+    def _learn(self, source: str, raw: str) -> Optional[str]:
+        """
+        Find the strptime format matching a sample string and remember it for the source.
+        Runs once per source; if no format fits, the source stays on the tokenizer.
+        """
+        self._formats[source] = None
+        for fmt in DATE_FORMATS:
+            try:
+                datetime.strptime(raw, fmt)
+            except ValueError:
+                continue
+            self._formats[source] = fmt
+            return fmt
+        return None
+
+
+# Shared instance so learned formats survive across scrapes in one process
+date_normalizer = DateNormalizer()
@@ -0,0 +1,38 @@
+"""
+Event Identity - the key both scrapers give an event in the events table
+
+The engine in scraper/ and the Greek Theatre scraper in scraper2/ write the
+same table, so a show scraped by either must get the same key and fingerprint.
+"""
+
+import hashlib
+import re
+from datetime import datetime
+
+def source_slug(name):
+    """File- and key-safe form of a source name, e.g. 'Greek Theatre' -> 'greek_theatre'"""
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+def normalize_start_time(value):
+    """'YYYY-MM-DD HH:MM:SS' for a timestamp string or datetime ('' if missing)"""
+    if not value:
+        return ''
+    if isinstance(value, datetime):
+        value = value.isoformat(sep=' ')
+    return str(value).replace('T', ' ')[:19]
+
+def event_key(source, event):
+    """
+    Stable identity for an event: source slug, normalized title and start time.
+
+    Nights of a multi-night show and repeats of a recurring event share their
+    title and often their URL (or, without a link, the listing URL), so the
+    start time tells them apart; the URL is used only when there is no start time.
+    """
+    title = ' '.join((event.get('title') or '').lower().split())
+    when = normalize_start_time(event.get('start_time')) or event.get('source_url') or ''
+    return f"{source_slug(source)}|{title}|{when}"
+
+def event_fingerprint(source, event):
+    """SHA-1 of the event key, used as the upsert key in the events table"""
+    return hashlib.sha1(event_key(source, event).encode('utf-8')).hexdigest()
@@ -0,0 +1,320 @@
+"""
+Local PostgREST - an in-process stand-in for the Supabase client, backed by SQLite
+
+Implements the part of supabase-py the scrapers use:
+
+    client.table('events').select('title,start_time').eq(...).gte(...).range(0, 999).execute()
+    client.table('events').insert(rows).execute()
+    client.table('events').upsert(rows, on_conflict='fingerprint').execute()
+    client.table('events').upsert(rows, on_conflict='fingerprint', ignore_duplicates=True).execute()
+
+with Postgres-like behaviour where it matters for the writers: each request
+is one transaction, unique violations (23505), an upsert touching a key twice
+(21000), ON CONFLICT on a column without a unique index (42P10) and unknown
+columns (PGRST204) raise an APIError-like LocalAPIError carrying the code.
+Every execute() costs one simulated round trip of `latency` (+ jitter)
+seconds, and fails with a transient statement timeout (57014) at
+`error_rate`, so retries, bisection and throughput can be measured without
+touching the real project.
+
+Plugged in with SUPABASE_LOCAL=<sqlite path or :memory:> (get_supabase()
+and scraper2's get_client() then return one), SCRAPER_SINK=local[:<path>],
+or SupabaseSink(client=...). SUPABASE_LOCAL_LATENCY_MS,
+SUPABASE_LOCAL_JITTER_MS and SUPABASE_LOCAL_ERROR_RATE tune it.
+scraper/bench_write.py load-tests the writer against it.
+"""
+
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+# Columns of the Supabase events table (mobile/types), plus the upsert key
+EVENTS_COLUMNS = ['title', 'description', 'category', 'location', 'latitude', 'longitude',
+                  'start_time', 'end_time', 'image_url', 'source_url', 'club_name', 'scraped_at',
+                  'fingerprint']
+
+DEFAULT_SCHEMAS = {'events': EVENTS_COLUMNS}
+DEFAULT_UNIQUE = {'events': ['fingerprint']}
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+class LocalAPIError(Exception):
+    """Mirrors postgrest.exceptions.APIError: code, message, details"""
+
+    def __init__(self, code, message, details=None):
+        super().__init__(f"{message} (code {code})")
+        self.code = code
+        self.message = message
+        self.details = details
+
+class LocalResponse:
+    """What execute() returns: the affected / selected rows and, if asked for, the count"""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+class LocalPostgrest:
+    """
+    Supabase-client stand-in over one SQLite database.
+
+    schemas: table -> fixed column list (other tables take whatever columns they are given)
+    unique: table -> columns with a unique index (what on_conflict may name)
+    latency / jitter: seconds added to every request; error_rate: share of requests that fail
+    """
+
+    def __init__(self, path=':memory:', latency=0.0, jitter=0.0, error_rate=0.0, seed=None,
+                 schemas=None, unique=None):
+        self.path = path
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.schemas = DEFAULT_SCHEMAS if schemas is None else schemas
+        self.unique = DEFAULT_UNIQUE if unique is None else unique
+        self.round_trips = Counter()
+        self.rows_written = 0
+        self.injected_errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._columns = {}
+
+    def table(self, name):
+        return LocalQuery(self, _identifier(name))
+
+    # supabase-py spelling
+    from_ = table
+
+    def stats(self):
+        return {'round_trips': dict(self.round_trips), 'total_round_trips': sum(self.round_trips.values()),
+                'rows_written': self.rows_written, 'injected_errors': self.injected_errors}
+
+    def close(self):
+        self._conn.close()
+
+    # --- Internals, called with self._lock held ---
+
+    def _ensure_table(self, table, columns=()):
+        """Create the table / add new columns; returns the column set"""
+        if table not in self._columns:
+            fixed = self.schemas.get(table, [])
+            self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                               f'created_at TEXT DEFAULT CURRENT_TIMESTAMP'
+                               + ''.join(f', "{column}"' for column in fixed) + ')')
+            existing = self._existing(table)
+            for column in self.unique.get(table, []):
+                if column not in existing:
+                    self._conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{column}"')
+                    existing.add(column)
+                self._conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{table}_{column}_key" '
+                                   f'ON "{table}" ("{column}")')
+            self._columns[table] = existing
+
+        known = self._columns[table]
+        for column in columns:
+            if column in known:
+                continue
+            if table in self.schemas:
+                raise LocalAPIError('PGRST204', f"Could not find the '{column}' column of '{table}' in the schema cache")
+            self._conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{_identifier(column)}"')
+            known.add(column)
+        return known
+
+    def _existing(self, table):
+        return {row[1] for row in self._conn.execute(f'PRAGMA table_info("{table}")')}
+
+    def _request(self, operation, table, run):
+        """One round trip: latency, maybe an injected failure, then `run()` in a transaction"""
+        with self._lock:
+            self.round_trips[(table, operation)] += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.injected_errors += 1
+                raise LocalAPIError('57014', "canceling statement due to statement timeout")
+            try:
+                with self._conn:
+                    return run()
+            except sqlite3.IntegrityError as e:
+                raise LocalAPIError('23505', f"duplicate key value violates unique constraint: {e}")
+            except sqlite3.OperationalError as e:
+                raise LocalAPIError('42703', str(e))
+
+class LocalQuery:
+    """Builder returned by table(); chain filters, then execute()"""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.operation = 'select'
+        self.columns = '*'
+        self.count = None
+        self.rows = None
+        self.on_conflict = None
+        self.ignore_duplicates = False
+        self.filters = []
+        self.ordering = []
+        self.offset = None
+        self.max_rows = None
+
+    # --- Operations ---
+
+    def select(self, columns='*', count=None):
+        self.operation, self.columns, self.count = 'select', columns, count
+        return self
+
+    def insert(self, rows):
+        self.operation, self.rows = 'insert', rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False):
+        self.operation, self.rows = 'upsert', rows if isinstance(rows, list) else [rows]
+        self.on_conflict = on_conflict
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    # --- Filters and modifiers ---
+
+    def _filter(self, column, op, value):
+        self.filters.append((_identifier(column), op, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, '=', value)
+
+    def neq(self, column, value):
+        return self._filter(column, '!=', value)
+
+    def gt(self, column, value):
+        return self._filter(column, '>', value)
+
+    def gte(self, column, value):
+        return self._filter(column, '>=', value)
+
+    def lt(self, column, value):
+        return self._filter(column, '<', value)
+
+    def lte(self, column, value):
+        return self._filter(column, '<=', value)
+
+    def in_(self, column, values):
+        return self._filter(column, 'IN', list(values))
+
+    def is_(self, column, value):
+        return self._filter(column, 'IS', None if value in (None, 'null') else value)
+
+    def order(self, column, desc=False):
+        self.ordering.append((_identifier(column), 'DESC' if desc else 'ASC'))
+        return self
+
+    def limit(self, count):
+        self.max_rows = count
+        return self
+
+    def range(self, start, end):
+        self.offset, self.max_rows = start, end - start + 1
+        return self
+
+    # --- Execution ---
+
+    def execute(self):
+        client = self.client
+        if self.operation == 'select':
+            return client._request('select', self.table, self._select)
+        return client._request(self.operation, self.table, self._write)
+
+    def _where(self):
+        clauses, params = [], []
+        for column, op, value in self.filters:
+            if op == 'IN':
+                clauses.append(f'"{column}" IN ({", ".join("?" for _ in value) or "NULL"})')
+                params.extend(_to_sql(v) for v in value)
+            elif op == 'IS':
+                clauses.append(f'"{column}" IS ?')
+                params.append(value)
+            else:
+                clauses.append(f'"{column}" {op} ?')
+                params.append(_to_sql(value))
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def _select(self):
+        columns = [c.strip() for c in self.columns.split(',') if c.strip()]
+        known = self.client._ensure_table(self.table)
+        where, params = self._where()
+
+        count = None
+        if self.count or columns == ['count']:
+            count = self.client._conn.execute(f'SELECT COUNT(*) FROM "{self.table}"{where}', params).fetchone()[0]
+        if columns == ['count']:
+            return LocalResponse([{'count': count}], count if self.count else None)
+
+        for column in columns:
+            if column != '*' and column not in known:
+                raise LocalAPIError('42703', f'column {self.table}.{column} does not exist')
+        select = ', '.join('*' if c == '*' else f'"{_identifier(c)}"' for c in columns) or '*'
+        sql = f'SELECT {select} FROM "{self.table}"{where}'
+        if self.ordering:
+            sql += ' ORDER BY ' + ', '.join(f'"{column}" {direction}' for column, direction in self.ordering)
+        if self.max_rows is not None or self.offset:
+            sql += f' LIMIT {int(self.max_rows if self.max_rows is not None else -1)} OFFSET {int(self.offset or 0)}'
+        rows = [dict(row) for row in self.client._conn.execute(sql, params)]
+        return LocalResponse(rows, count)
+
+    def _write(self):
+        rows = self.rows or []
+        if not rows:
+            return LocalResponse([])
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        self.client._ensure_table(self.table, columns)
+        quoted = ', '.join(f'"{_identifier(c)}"' for c in columns)
+        sql = f'INSERT INTO "{self.table}" ({quoted}) VALUES ({", ".join("?" for _ in columns)})'
+
+        if self.operation == 'upsert' and self.on_conflict:
+            key = _identifier(self.on_conflict)
+            if key not in self.client.unique.get(self.table, []):
+                raise LocalAPIError('42P10', "there is no unique or exclusion constraint matching "
+                                             "the ON CONFLICT specification")
+            updates = ', '.join(f'"{c}" = excluded."{c}"' for c in columns if c != key)
+            if self.ignore_duplicates or not updates:
+                sql += f' ON CONFLICT ("{key}") DO NOTHING'
+            else:
+                keys = [row.get(key) for row in rows]
+                if len(set(keys)) < len(keys):
+                    raise LocalAPIError('21000', "ON CONFLICT DO UPDATE command cannot affect row a second time")
+                sql += f' ON CONFLICT ("{key}") DO UPDATE SET {updates}'
+
+        written = []
+        for row in rows:
+            cursor = self.client._conn.execute(sql + ' RETURNING *', [_to_sql(row.get(c)) for c in columns])
+            written.extend(dict(r) for r in cursor.fetchall())
+        self.client.rows_written += len(rows)
+        return LocalResponse(written)
+
+def _identifier(name):
+    if not isinstance(name, str) or not _IDENTIFIER.match(name):
+        raise LocalAPIError('42703', f"invalid identifier {name!r}")
+    return name
+
+def _to_sql(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+def client_from_env(path=None):
+    """A LocalPostgrest configured from SUPABASE_LOCAL* environment variables"""
+    return LocalPostgrest(
+        path or os.getenv("SUPABASE_LOCAL") or ':memory:',
+        latency=float(os.getenv("SUPABASE_LOCAL_LATENCY_MS", "0")) / 1000,
+        jitter=float(os.getenv("SUPABASE_LOCAL_JITTER_MS", "0")) / 1000,
+        error_rate=float(os.getenv("SUPABASE_LOCAL_ERROR_RATE", "0")),
+    )
@@ -0,0 +1,337 @@
+"""
+API Sources - reads CalLink and Berkeley Events from their JSON / iCal feeds
+
+CalLink is a React app over the Engage discovery API, and events.berkeley.edu
+is a LiveWhale calendar with JSON and iCal feeds. Reading those directly with
+the shared pooled HTTP client gives the same event dicts as the browser scrapers
+without starting Chrome; the browser path stays as a fallback.
+
+Recorded responses can stand in for the network (see Fetcher), so the
+adapters run offline; fixtures/api holds a small committed set covering the
+first CalLink page, the first two weeks of Berkeley Events and the iCal feed
+(tests/test_api_sources.py replays it):
+    python api_sources.py --record --fixtures fixtures/api   # save responses
+    SCRAPER_BERKELEY_DAYS=14 python api_sources.py --fixtures fixtures/api   # replay them
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import parse_qsl, urlencode, urlparse
+from zoneinfo import ZoneInfo
+
+from bs4 import BeautifulSoup
+
+from async_fetch import get_fetcher
+from categorize import categorize_events
+from pagination import crawl
+
+CALLINK_API_URL = "https://callink.berkeley.edu/api/discovery/event/search"
+CALLINK_EVENT_URL = "https://callink.berkeley.edu/event/{id}"
+CALLINK_IMAGE_URL = "https://se-images.campuslabs.com/clink/images/{path}?preset=med-w"
+CALLINK_PAGE_SIZE = 100
+
+BERKELEY_JSON_URL = "https://events.berkeley.edu/live/json/events/start_date/{start}/end_date/{end}/max/{max}/"
+BERKELEY_ICAL_URL = "https://events.berkeley.edu/live/ical/events"
+# Most records LiveWhale returns for one request, and the date window each request starts with
+BERKELEY_PAGE_SIZE = 500
+BERKELEY_WINDOW_DAYS = 14
+
+# Timestamps are stored as campus-local wall time, like the other scrapers
+LOCAL_TZ = ZoneInfo("America/Los_Angeles")
+
+# Query parameters that change every run and are left out of fixture names
+VOLATILE_PARAMS = {'endsAfter'}
+# Dates in a URL path, named relative to today in fixture names
+_PATH_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+def default_berkeley_days():
+    """How many days ahead Berkeley Events are read"""
+    return int(os.getenv("SCRAPER_BERKELEY_DAYS", "180"))
+
+class Fetcher:
+    """
+    HTTP GETs through the shared async fetcher that can be recorded to, or
+    replayed from, fixture files.
+
+    fixture_dir: replay responses from this directory instead of the network
+    record: fetch from the network and also save each response into fixture_dir
+    """
+
+    def __init__(self, fixture_dir=None, record=False):
+        self.fixture_dir = fixture_dir
+        self.record = record
+
+    def fixture_path(self, url):
+        """File a response for `url` is recorded under"""
+        parsed = urlparse(url)
+        # Date windows start today (campus time), so a recording replays on a later day too
+        today = datetime.now(LOCAL_TZ).date()
+        path = _PATH_DATE.sub(lambda m: f"{(date.fromisoformat(m.group()) - today).days:+d}d", parsed.path)
+        slug = re.sub(r'[^a-z0-9]+', '_', f"{parsed.netloc}{path}".lower()).strip('_')
+        query = urlencode([(k, v) for k, v in parse_qsl(parsed.query) if k not in VOLATILE_PARAMS])
+        digest = hashlib.sha1(f"{parsed.netloc}{path}?{query}".encode('utf-8')).hexdigest()[:10]
+        return os.path.join(self.fixture_dir, f"{slug}_{digest}.txt")
+
+    def get_text(self, url):
+        if self.fixture_dir and not self.record:
+            with open(self.fixture_path(url), encoding='utf-8') as f:
+                return f.read()
+
+        response = get_fetcher().get(url)
+        response.raise_for_status()
+        if self.record and self.fixture_dir:
+            os.makedirs(self.fixture_dir, exist_ok=True)
+            with open(self.fixture_path(url), 'w', encoding='utf-8') as f:
+                f.write(response.text)
+        return response.text
+
+    def get_json(self, url):
+        return json.loads(self.get_text(url))
+
+_default_fetcher = None
+
+def default_fetcher():
+    """Shared fetcher; replays from SCRAPER_API_FIXTURES if set (records when SCRAPER_API_RECORD=1)"""
+    global _default_fetcher
+    if _default_fetcher is None:
+        _default_fetcher = Fetcher(fixture_dir=os.getenv("SCRAPER_API_FIXTURES") or None,
+                                   record=os.getenv("SCRAPER_API_RECORD") == "1")
+    return _default_fetcher
+
+def to_timestamp(value):
+    """ISO 8601 string (or date/datetime) -> 'YYYY-MM-DD HH:MM:SS' in campus time, or None"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is not None:
+        value = value.astimezone(LOCAL_TZ).replace(tzinfo=None)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+def html_to_text(html):
+    """Plain text of an HTML fragment (API descriptions are HTML)"""
+    if not html:
+        return ""
+    return BeautifulSoup(html, 'lxml').get_text(' ', strip=True)
+
+def make_event(title, description, source_url, location=None, start_time=None, end_time=None,
+               image_url=None, club_name=None):
+    """Build an event dict in the same shape the HTML scrapers produce (categorized later, in batches)"""
+    return {
+        'title': title[:200],
+        'description': description[:500] if description else None,
+        'category': None,
+        'location': location or "Berkeley, CA",
+        'start_time': start_time,
+        'end_time': end_time,
+        'source_url': source_url,
+        'image_url': image_url,
+        'club_name': club_name,
+        'scraped_at': datetime.now().isoformat()
+    }
+
+# --- CalLink (Engage discovery API) ---
+
+def callink_page_url(skip, ends_after):
+    return CALLINK_API_URL + "?" + urlencode({
+        'endsAfter': ends_after,
+        'orderByField': 'endsOn',
+        'orderByDirection': 'ascending',
+        'status': 'Approved',
+        'take': CALLINK_PAGE_SIZE,
+        'skip': skip,
+    })
+
+def map_callink_event(record):
+    """One Engage API record -> event dict (None if it has no usable title)"""
+    title = (record.get('name') or '').strip()
+    if len(title) <= 3:
+        return None
+    image_path = record.get('imagePath')
+    return make_event(
+        title=title,
+        description=html_to_text(record.get('description')),
+        source_url=CALLINK_EVENT_URL.format(id=record.get('id')),
+        location=record.get('location'),
+        start_time=to_timestamp(record.get('startsOn')),
+        end_time=to_timestamp(record.get('endsOn')),
+        image_url=CALLINK_IMAGE_URL.format(path=image_path) if image_path else None,
+        club_name=record.get('organizationName'),
+    )
+
+def iter_callink_events(fetcher=None, ends_after=None):
+    """Yield upcoming approved CalLink events page by page; pages after the first are fetched concurrently"""
+    fetcher = fetcher or default_fetcher()
+    ends_after = ends_after or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    first_url = callink_page_url(0, ends_after)
+
+    def fetch_page(url):
+        data = fetcher.get_json(url)
+        events = [e for e in map(map_callink_event, data.get('value') or []) if e]
+        # The first page tells us how many there are; queue the rest at once
+        next_urls = []
+        if url == first_url:
+            total = data.get('@odata.count') or 0
+            next_urls = [callink_page_url(skip, ends_after)
+                         for skip in range(CALLINK_PAGE_SIZE, total, CALLINK_PAGE_SIZE)]
+        return events, next_urls
+
+    for _, page_events in crawl(first_url, fetch_page):
+        yield page_events
+
+def fetch_callink_events(fetcher=None, ends_after=None):
+    """All upcoming approved CalLink events as one list"""
+    return [event for page in iter_callink_events(fetcher, ends_after) for event in page]
+
+# --- Berkeley Events (LiveWhale JSON, iCal as backup) ---
+
+def map_livewhale_event(record):
+    """One LiveWhale JSON record -> event dict (None if it has no usable title)"""
+    title = html_to_text(record.get('title'))
+    if len(title) <= 3:
+        return None
+    return make_event(
+        title=title,
+        description=html_to_text(record.get('description') or record.get('summary')),
+        source_url=record.get('url') or "https://events.berkeley.edu/",
+        location=html_to_text(record.get('location_title') or record.get('location')),
+        start_time=to_timestamp(record.get('date_iso')),
+        end_time=to_timestamp(record.get('date2_iso')),
+        image_url=record.get('thumbnail'),
+        club_name=record.get('group_title'),
+    )
+
+def unfold_ical(text):
+    """Undo RFC 5545 line folding"""
+    return re.sub(r'\r?\n[ \t]', '', text).splitlines()
+
+def ical_value(value):
+    return value.replace('\\n', '\n').replace('\\N', '\n').replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\')
+
+def ical_datetime(params, value):
+    """DTSTART/DTEND value -> timestamp string, honouring VALUE=DATE, UTC 'Z' and TZID"""
+    value = value.strip()
+    if 'VALUE=DATE' in params or len(value) == 8:
+        return to_timestamp(date(int(value[:4]), int(value[4:6]), int(value[6:8])))
+    parsed = datetime.strptime(value.rstrip('Z'), "%Y%m%dT%H%M%S")
+    if value.endswith('Z'):
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    else:
+        tzid = re.search(r'TZID=([^;:]+)', params)
+        if tzid:
+            try:
+                parsed = parsed.replace(tzinfo=ZoneInfo(tzid.group(1)))
+            except Exception:
+                pass
+    return to_timestamp(parsed)
+
+def parse_ical_events(text):
+    """VEVENTs of an iCalendar feed -> event dicts"""
+    events = []
+    current = None
+    for line in unfold_ical(text):
+        if line == 'BEGIN:VEVENT':
+            current = {}
+        elif line == 'END:VEVENT' and current is not None:
+            title = ical_value(current.get('SUMMARY', ('', ''))[1]).strip()
+            if len(title) > 3:
+                start, end = current.get('DTSTART'), current.get('DTEND')
+                events.append(make_event(
+                    title=title,
+                    description=html_to_text(ical_value(current.get('DESCRIPTION', ('', ''))[1])),
+                    source_url=current.get('URL', ('', "https://events.berkeley.edu/"))[1],
+                    location=ical_value(current.get('LOCATION', ('', ''))[1]) or None,
+                    start_time=ical_datetime(*start) if start else None,
+                    end_time=ical_datetime(*end) if end else None,
+                ))
+            current = None
+        elif current is not None and ':' in line:
+            name, value = line.split(':', 1)
+            key, _, params = name.partition(';')
+            current.setdefault(key.upper(), (params, value))
+    return events
+
+def berkeley_page_url(start, end):
+    return BERKELEY_JSON_URL.format(start=start.isoformat(), end=end.isoformat(), max=BERKELEY_PAGE_SIZE)
+
+def iter_berkeley_events(fetcher=None, start=None, days=None):
+    """
+    Yield upcoming events.berkeley.edu events one date window at a time.
+
+    LiveWhale returns at most BERKELEY_PAGE_SIZE records per request, so the
+    next `days` are read in BERKELEY_WINDOW_DAYS windows, fetched concurrently
+    by crawl(). A window that comes back full may have been cut off; it is
+    split in half and both halves are fetched instead. Falls back to the iCal
+    feed if no JSON window could be read.
+    """
+    fetcher = fetcher or default_fetcher()
+    start = start or datetime.now(LOCAL_TZ).date()
+    last = start + timedelta(days=(days or default_berkeley_days()) - 1)
+    step = timedelta(days=BERKELEY_WINDOW_DAYS)
+    one_day = timedelta(days=1)
+    windows = {}
+
+    def window_url(first, until):
+        url = berkeley_page_url(first, until)
+        windows[url] = (first, until)
+        return url
+
+    first_url = window_url(start, min(start + step - one_day, last))
+
+    def fetch_page(url):
+        first, until = windows[url]
+        records = fetcher.get_json(url)
+        if isinstance(records, dict):
+            records = records.get('data') or records.get('events') or []
+        # The first window queues the rest of the horizon at once
+        next_urls = []
+        if url == first_url:
+            day = until + one_day
+            while day <= last:
+                next_urls.append(window_url(day, min(day + step - one_day, last)))
+                day += step
+        if len(records) >= BERKELEY_PAGE_SIZE:
+            if first < until:
+                middle = first + (until - first) // 2
+                return [], next_urls + [window_url(first, middle), window_url(middle + one_day, until)]
+            print(f"   ⚠️  {first}: {len(records)} Berkeley Events in one day, some may be missing")
+        return [e for e in map(map_livewhale_event, records) if e], next_urls
+
+    # Room for every window to be split a few times
+    max_pages = 4 * ((last - start).days // BERKELEY_WINDOW_DAYS + 1)
+    read = False
+    for _, page_events in crawl(first_url, fetch_page, max_pages=max_pages):
+        read = True
+        yield page_events
+    if not read:
+        print("   ⚠️  LiveWhale JSON feed failed, trying iCal")
+        yield parse_ical_events(fetcher.get_text(BERKELEY_ICAL_URL))
+
+def fetch_berkeley_events(fetcher=None, start=None, days=None):
+    """All upcoming events.berkeley.edu events as one list"""
+    return [event for page in iter_berkeley_events(fetcher, start, days) for event in page]
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch CalLink and Berkeley Events from their feeds")
+    parser.add_argument('--fixtures', help="Replay recorded responses from this directory")
+    parser.add_argument('--record', action='store_true', help="Fetch live and save responses into --fixtures")
+    args = parser.parse_args()
+
+    fetcher = Fetcher(fixture_dir=args.fixtures, record=args.record)
+    for name, fetch in [('CalLink', fetch_callink_events), ('Berkeley Events', fetch_berkeley_events)]:
+        events = categorize_events(fetch(fetcher))
+        print(f"\n📊 {name}: {len(events)} events")
+        for event in events[:5]:
+            print(f"   • {event['start_time'] or '?'}  {event['title'][:60]} [{event['category']}]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Async Fetch - one pooled HTTP client for every static page and feed request
+
+An httpx.AsyncClient runs on a background event loop, so the threaded
+scrapers can hand it many URLs at once and their network waits overlap.
+Connections are kept alive and reused, HTTP/2 is used when the h2 package
+is installed, each host gets its own concurrency limit, and timeouts, 429s
+and 5xx responses are retried with backoff.
+"""
+
+import asyncio
+import atexit
+import os
+import random
+import threading
+from urllib.parse import urlparse
+
+import httpx
+
+from metrics import get_metrics
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+
+# Responses worth another try; anything else is returned to the caller as is
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def default_host_limit():
+    """How many requests may be in flight to one host at a time"""
+    return int(os.getenv("SCRAPER_HOST_CONCURRENCY", "6"))
+
+def http2_available():
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+class AsyncFetcher:
+    """
+    Shared async HTTP client with blocking wrappers for the threaded scrapers.
+
+    get(url) / get_many(urls) can be called from any thread; the coroutines
+    fetch(url) / fetch_many(urls) are there for async callers.
+    """
+
+    def __init__(self, host_limit=None, max_connections=20, timeout=15, retries=2, backoff=0.5):
+        self.host_limit = host_limit or default_host_limit()
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._client = None
+        self._host_slots = {}
+        self._host_limits = {}
+
+    def set_host_limit(self, host, limit):
+        """Use a different concurrency limit for one host (before its first request)"""
+        self._host_limits[host] = max(1, limit)
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name='async-fetch', daemon=True)
+                self._thread.start()
+        return self._loop
+
+    def _get_client(self):
+        # Only touched from the loop thread, so no locking needed
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=http2_available(),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                timeout=httpx.Timeout(self.timeout),
+                headers=DEFAULT_HEADERS,
+                follow_redirects=True,
+            )
+        return self._client
+
+    def _slot(self, url):
+        host = urlparse(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self._host_limits.get(host, self.host_limit))
+        return self._host_slots[host]
+
+    def _delay(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(int(retry_after), 30)
+        return self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+
+    async def fetch(self, url, headers=None):
+        """GET a URL, retrying transport errors and retryable statuses; returns the httpx.Response"""
+        client = self._get_client()
+        metrics = get_metrics()
+        host = urlparse(url).netloc
+        async with self._slot(url):
+            started = asyncio.get_running_loop().time()
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    metrics.count('retries', host)
+                metrics.count('requests', host)
+                try:
+                    response = await client.get(url, headers=headers)
+                except httpx.TransportError:
+                    if attempt == self.retries:
+                        metrics.count('http_errors', host)
+                        raise
+                    await asyncio.sleep(self._delay(attempt))
+                    continue
+                if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                    await asyncio.sleep(self._delay(attempt, response))
+                    continue
+                metrics.observe('fetch', host, asyncio.get_running_loop().time() - started)
+                metrics.count('bytes', host, len(response.content))
+                if response.status_code >= 400:
+                    metrics.count('http_errors', host)
+                return response
+
+    async def fetch_many(self, urls, headers=None, headers_by_url=None):
+        """
+        Fetch URLs concurrently; each result is a Response or the exception it raised.
+        headers_by_url adds per-URL headers (e.g. conditional request validators).
+        """
+        headers_by_url = headers_by_url or {}
+        return await asyncio.gather(*(self.fetch(url, {**(headers or {}), **headers_by_url.get(url, {})})
+                                      for url in urls), return_exceptions=True)
+
+    def get(self, url, headers=None):
+        """Blocking fetch() for threaded callers"""
+        return asyncio.run_coroutine_threadsafe(self.fetch(url, headers), self._ensure_loop()).result()
+
+    def get_many(self, urls, headers=None, headers_by_url=None):
+        """Blocking fetch_many() for threaded callers, results in the order of `urls`"""
+        return asyncio.run_coroutine_threadsafe(self.fetch_many(list(urls), headers, headers_by_url),
+                                                self._ensure_loop()).result()
+
+    def close(self):
+        """Close pooled connections and stop the loop"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._client.aclose(), loop).result(timeout=5)
+            except Exception:
+                pass
+            self._client = None
+        self._host_slots = {}
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+        loop.close()
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+def get_fetcher():
+    """Process-wide fetcher, so every source shares one connection pool"""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = AsyncFetcher()
+            atexit.register(_fetcher.close)
+    return _fetcher
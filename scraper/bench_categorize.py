@@ -0,0 +1,71 @@
+"""
+Categorizer Benchmark - compiled keyword matcher (per event and batched) vs the old substring scan
+
+Usage: python bench_categorize.py [number_of_events]
+"""
+
+import random
+import sys
+import time
+
+from categorize import CATEGORY_KEYWORDS, categorize_event, categorize_events
+
+FILLER = ['annual', 'spring', 'student', 'berkeley', 'night', 'with', 'the', 'for', 'and',
+          'club', 'center', 'open', 'hall', 'session', 'weekly', 'free', 'campus', 'brunch',
+          'party', 'smart', 'department', 'heart', 'startrun']
+
+def legacy_categorize(title, description):
+    """The original per-keyword substring scan, kept here as the baseline"""
+    text = f"{title} {description}".lower()
+    category_scores = {}
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        score = sum(1 for keyword in keywords if keyword in text)
+        if score > 0:
+            category_scores[category] = score
+    if category_scores:
+        return max(category_scores, key=category_scores.get)
+    return 'leisure'
+
+def synthetic_events(count, keyword_rate=0.05, seed=42):
+    """Titles and ~500-character descriptions where about `keyword_rate` of words are keywords"""
+    rng = random.Random(seed)
+    vocabulary = [word for words in CATEGORY_KEYWORDS.values() for word in words]
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    filler = FILLER + [''.join(rng.choice(letters) for _ in range(rng.randint(2, 10))) for _ in range(2000)]
+
+    def words(n):
+        return ' '.join(rng.choice(vocabulary) if rng.random() < keyword_rate else rng.choice(filler)
+                        for _ in range(n))
+
+    return [(words(rng.randint(3, 8)).title(), words(rng.randint(60, 90))) for _ in range(count)]
+
+def time_it(categorize, events):
+    start = time.perf_counter()
+    results = [categorize(title, description) for title, description in events]
+    return time.perf_counter() - start, results
+
+def time_batch(events):
+    batch = [{'title': title, 'description': description} for title, description in events]
+    start = time.perf_counter()
+    categorize_events(batch)
+    return time.perf_counter() - start, [event['category'] for event in batch]
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    events = synthetic_events(count)
+
+    legacy_seconds, legacy_results = time_it(legacy_categorize, events)
+    compiled_seconds, compiled_results = time_it(categorize_event, events)
+    batch_seconds, batch_results = time_batch(events)
+    changed = sum(1 for a, b in zip(legacy_results, compiled_results) if a != b)
+    assert batch_results == compiled_results, "categorize_events disagrees with categorize_event"
+
+    print(f"📊 {count} synthetic events")
+    print(f"   Substring scan: {legacy_seconds * 1000:8.1f} ms ({count / legacy_seconds:,.0f} events/s)")
+    print(f"   Compiled match: {compiled_seconds * 1000:8.1f} ms ({count / compiled_seconds:,.0f} events/s)")
+    print(f"   Batch match:    {batch_seconds * 1000:8.1f} ms ({count / batch_seconds:,.0f} events/s)")
+    print(f"   Speedup: {legacy_seconds / compiled_seconds:.1f}x per event, {legacy_seconds / batch_seconds:.1f}x batched")
+    print(f"   Different category: {changed} ({changed / count:.1%}) - word boundaries, e.g. 'party' no longer counts as 'art'")
+
+if __name__ == "__main__":
+    main()
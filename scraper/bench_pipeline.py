@@ -0,0 +1,227 @@
+"""
+Pipeline Benchmark - replays listing pages offline through extract, normalize, categorize and dedup
+
+Pages come from two places, so neither the network nor Chrome is needed:
+  - synthetic listings built from each source's card markup, at any size
+    (about 5% of cards repeat an earlier one, for dedup to drop)
+  - the fixture corpus: a saved listing page per source (fixtures/pages, run
+    by default; --record replaces them with the live pages), and feed
+    responses recorded by api_sources.py (--api-fixtures)
+
+Each case runs through the engine's extraction and the pipeline stages into a
+MemorySink, once timed and once under tracemalloc, and reports events/s, peak
+memory and the time per stage.
+
+Usage:
+    python bench_pipeline.py                                   # 1k, 10k and 50k cards and the saved page per source
+    python bench_pipeline.py --cards 2000 --source "Greek Theatre"
+    python bench_pipeline.py --record                          # re-save the live listing pages
+    python bench_pipeline.py --api-fixtures fixtures/api
+    python bench_pipeline.py --save bench.json                 # keep the results...
+    python bench_pipeline.py --baseline bench.json             # ...and fail on a >20% slowdown
+"""
+
+import argparse
+import calendar
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from html import escape
+
+from bs4 import BeautifulSoup
+
+from async_fetch import get_fetcher
+from bench_categorize import synthetic_events
+from engine import events_from_cards, find_containers
+from metrics import start_run
+from pipeline import Batch, PipelineStats, categorize, dedup, normalize, write
+from sinks import MemorySink
+from sources import get_sources
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+DUPLICATE_RATE = 0.05
+STAGES = ('api', 'parse', 'extract', 'normalize', 'categorize', 'dedup', 'flush')
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'pages')
+
+# One listing card per source, shaped like the live markup its selectors target
+CARD_TEMPLATES = {
+    'CalLink': (
+        '<div class="MuiPaper-root MuiCard-root"><a href="/event/{id}">'
+        '<div role="img" style="background-image: url(&quot;https://se-images.campuslabs.com/clink/images/{id}.png&quot;)"></div>'
+        '<h3>{title}</h3><p>{description}</p><span class="location">{location}</span>'
+        '<span class="organization">Club {id}</span></a></div>'
+    ),
+    'Berkeley Events': (
+        '<div class="lw_cal_event"><h3 class="lw_title"><a href="/event/{id}">{title}</a></h3>'
+        '<div class="lw_summary"><p>{description}</p></div>'
+        '<div class="lw_location">{location}</div><img src="/live/image/{id}.jpg"></div>'
+    ),
+    'Greek Theatre': (
+        '<div class="mix detail-information"><a href="/events/{id}/"><img src="/wp-content/uploads/{id}.jpg"></a>'
+        '<h2 class="show-title">{title}</h2><p>{description}</p>'
+        '<span class="date-show" content="{date}">{date}</span></div>'
+    ),
+}
+
+LOCATIONS = ['Zellerbach Hall', 'Sproul Plaza', 'MLK Student Union', 'Doe Library', 'Haas Pavilion']
+
+def synthetic_page(source_name, cards, seed=42):
+    """A listing page of `cards` cards in the source's markup (some repeated)"""
+    rng = random.Random(seed)
+    events = synthetic_events(cards, seed=seed)
+    template = CARD_TEMPLATES[source_name]
+    parts = []
+    for i in range(cards):
+        j = rng.randrange(i) if i and rng.random() < DUPLICATE_RATE else i
+        title, description = events[j]
+        date = f"{calendar.month_name[j % 12 + 1]} {j % 28 + 1}, 2026 7:00 pm"
+        parts.append(template.format(id=j, title=escape(title), description=escape(description[:300]),
+                                     location=LOCATIONS[j % len(LOCATIONS)], date=date))
+    return f"<!DOCTYPE html><html><body><main>{''.join(parts)}</main></body></html>"
+
+def html_pages(source, html):
+    """Page producer for a listing page: parsed and extracted like the static mode does"""
+    def produce(metrics):
+        with metrics.timer('parse', source.name):
+            soup = BeautifulSoup(html, 'lxml')
+        return [events_from_cards(source, find_containers(source, soup), source.url)]
+    return produce
+
+def api_pages(source):
+    """Page producer for a feed, replayed from the recorded responses"""
+    def produce(metrics):
+        with metrics.timer('api', source.name):
+            return [list(page) for page in source.api()]
+    return produce
+
+def run_stages(source, produce, flush_size):
+    """Run one case through the stages; returns (seconds, PipelineStats, MemorySink, RunMetrics)"""
+    metrics = start_run()
+    stats = PipelineStats()
+    sink = MemorySink()
+    started = time.perf_counter()
+    pages = produce(metrics)
+    batches = normalize((Batch(source.name, events, []) for events in pages), stats)
+    batches = categorize(batches, stats)
+    batches = dedup(batches, stats)
+    write(batches, stats, sink, flush_size=flush_size)
+    return time.perf_counter() - started, stats, sink, metrics
+
+def bench_case(label, source, produce, flush_size, size_bytes=None):
+    seconds, stats, sink, metrics = run_stages(source, produce, flush_size)
+    stage_seconds = {stage: round(h.sum, 4) for (stage, _), h in metrics.timings.items() if stage in STAGES}
+
+    tracemalloc.start()
+    run_stages(source, produce, flush_size)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    events = len(sink.events)
+    result = {
+        'case': f"{source.name} | {label}",
+        'cards': sum(count for (name, _), count in metrics.counters.items() if name == 'cards'),
+        'events': events,
+        'duplicates': sum(stats.duplicates.values()),
+        'seconds': round(seconds, 4),
+        'events_per_second': round(events / seconds, 1) if seconds else 0.0,
+        'peak_mb': round(peak / 1e6, 1),
+        'stages': stage_seconds,
+    }
+
+    print(f"\n📊 {result['case']}" + (f" ({size_bytes / 1e6:.1f} MB)" if size_bytes else ""))
+    print(f"   {events:,} events in {seconds:.2f}s → {result['events_per_second']:,.0f} events/s, "
+          f"peak {result['peak_mb']:.1f} MB, {result['duplicates']:,} duplicates dropped")
+    print("   " + " | ".join(f"{stage} {stage_seconds[stage]:.3f}s" for stage in STAGES if stage in stage_seconds))
+    return result
+
+def record(sources, fixture_dir):
+    """Save each static source's live listing page into the corpus"""
+    os.makedirs(fixture_dir, exist_ok=True)
+    for source in sources:
+        if 'static' not in source.modes and 'browser' not in source.modes:
+            continue
+        response = get_fetcher().get(source.url)
+        if not response.is_success:
+            print(f"   ⚠️  {source.name}: HTTP {response.status_code}, not saved")
+            continue
+        path = os.path.join(fixture_dir, f"{source.slug}.html")
+        with open(path, 'wb') as f:
+            f.write(response.content)
+        print(f"   💾 {source.name}: {len(response.content):,} bytes -> {path}")
+
+def compare(results, baseline_path, tolerance):
+    """Print throughput against a saved run; returns the cases that got slower than `tolerance`"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {result['case']: result for result in json.load(f)}
+    slower = []
+    print(f"\n📏 Against {baseline_path}:")
+    for result in results:
+        before = baseline.get(result['case'])
+        if not before or not before['events_per_second']:
+            continue
+        change = result['events_per_second'] / before['events_per_second'] - 1
+        flag = "❌" if change < -tolerance else "✅"
+        print(f"   {flag} {result['case']}: {change:+.0%} events/s")
+        if change < -tolerance:
+            slower.append(result['case'])
+    return slower
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction and the pipeline stages offline")
+    parser.add_argument('--source', action='append', help="Source name (repeatable; default: all)")
+    parser.add_argument('--cards', type=int, nargs='*', default=list(DEFAULT_SIZES),
+                        help="Synthetic page sizes (cards per page)")
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURE_DIR,
+                        help="Directory of saved listing pages (<source slug>.html; default: fixtures/pages)")
+    parser.add_argument('--api-fixtures', help="Directory of recorded feed responses (see api_sources.py)")
+    parser.add_argument('--record', action='store_true', help="Save the live listing pages into --fixtures and exit")
+    parser.add_argument('--flush-size', type=int, default=100)
+    parser.add_argument('--save', help="Write the results to this JSON file")
+    parser.add_argument('--baseline', help="Compare with results saved by --save; exit 1 on a slowdown")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed events/s drop (default 0.2)")
+    args = parser.parse_args()
+
+    sources = get_sources(args.source)
+    if args.record:
+        record(sources, args.fixtures)
+        return
+
+    if args.api_fixtures:
+        # api_sources.default_fetcher() replays from here instead of the network
+        os.environ["SCRAPER_API_FIXTURES"] = args.api_fixtures
+
+    results = []
+    for source in sources:
+        if source.name in CARD_TEMPLATES:
+            for cards in args.cards:
+                html = synthetic_page(source.name, cards)
+                results.append(bench_case(f"synthetic {cards:,} cards", source, html_pages(source, html),
+                                          args.flush_size, len(html)))
+        else:
+            print(f"\n⏭️  {source.name}: no card template, synthetic pages skipped")
+
+        path = os.path.join(args.fixtures, f"{source.slug}.html")
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                html = f.read()
+            results.append(bench_case("saved page", source, html_pages(source, html), args.flush_size, len(html)))
+
+        if args.api_fixtures and source.api:
+            try:
+                results.append(bench_case("recorded feed", source, api_pages(source), args.flush_size))
+            except FileNotFoundError as e:
+                print(f"\n⏭️  {source.name}: no recorded feed ({e.filename})")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results saved to {args.save}")
+
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
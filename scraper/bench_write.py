@@ -0,0 +1,64 @@
+"""
+Write Benchmark - load-tests the event writer against the local PostgREST stand-in
+
+Writes synthetic events through SupabaseSink into campus_events.local_postgrest,
+with a simulated round trip per request and injected statement timeouts, and
+reports rows per second, round trips and injected errors for each run. The second run
+writes the same rows again, so it shows the cost of re-upserting unchanged events.
+
+    python bench_write.py --rows 5000 --latency 80 --error-rate 0.02
+    python bench_write.py --rows 2000 --chunk 1      # the old one-request-per-event pattern
+"""
+
+import argparse
+import os
+import time
+
+from campus_events.local_postgrest import LocalPostgrest
+
+from bench_categorize import synthetic_events
+from sinks import SupabaseSink
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the event writer against a local PostgREST stand-in")
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=80, help="Milliseconds per round trip")
+    parser.add_argument('--jitter', type=float, default=20, help="Extra random milliseconds per round trip")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of requests that time out")
+    parser.add_argument('--chunk', type=int, help="Rows per request (default: SCRAPER_WRITE_CHUNK)")
+    parser.add_argument('--workers', type=int, help="Requests in flight (default: SCRAPER_WRITE_WORKERS)")
+    parser.add_argument('--insert', action='store_true', help="Plain inserts instead of upserts")
+    parser.add_argument('--runs', type=int, default=2, help="Write the same rows this many times")
+    args = parser.parse_args()
+
+    if args.chunk:
+        os.environ["SCRAPER_WRITE_CHUNK"] = str(args.chunk)
+    if args.workers:
+        os.environ["SCRAPER_WRITE_WORKERS"] = str(args.workers)
+
+    client = LocalPostgrest(latency=args.latency / 1000, jitter=args.jitter / 1000,
+                            error_rate=args.error_rate, seed=1)
+    sink = SupabaseSink(on_conflict=None if args.insert else 'fingerprint', client=client)
+    rows = [{'title': title, 'description': description[:500], 'category': 'leisure',
+             'location': 'Berkeley, CA', 'start_time': f"2026-05-{i % 28 + 1:02d} 19:00:00",
+             'source_url': f"https://example.org/event/{i}", 'fingerprint': f"bench-{i}"}
+            for i, (title, description) in enumerate(synthetic_events(args.rows))]
+
+    print(f"🧪 {args.rows} rows, {args.latency:.0f}±{args.jitter:.0f} ms per request, "
+          f"{args.error_rate:.0%} injected timeouts, {'insert' if args.insert else 'upsert'}")
+    for run in range(1, args.runs + 1):
+        before = client.stats()
+        started = time.perf_counter()
+        report = sink.write(rows)
+        seconds = time.perf_counter() - started
+        after = client.stats()
+        print(f"   Run {run}: {report.written}/{len(rows)} rows in {seconds:.2f}s "
+              f"({report.written / seconds:,.0f} rows/s), "
+              f"{after['total_round_trips'] - before['total_round_trips']} round trips, "
+              f"{after['injected_errors'] - before['injected_errors']} injected errors")
+
+    stored = client.table('events').select('count', count='exact').execute().count
+    print(f"   Rows stored: {stored}")
+
+if __name__ == "__main__":
+    main()
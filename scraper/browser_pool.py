@@ -0,0 +1,119 @@
+"""
+Browser Pool - keeps headless Chrome sessions alive across sources and runs
+"""
+
+import atexit
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+def default_max_workers():
+    """How many sources may scrape at once (each browser-based source uses its own Chrome)"""
+    return int(os.getenv("SCRAPER_MAX_WORKERS", "4"))
+
+class DriverPool:
+    """
+    Hands out reusable Chrome drivers instead of launching one per source.
+
+    Drivers are created lazily with `factory` (a script's setup_driver), at most
+    `max_size` at a time, and reset to a blank page with cleared cookies and
+    storage when returned so sources do not see each other's state.
+    """
+
+    def __init__(self, factory, max_size=None):
+        self.factory = factory
+        self.max_size = max(1, max_size or default_max_workers())
+        self._idle = queue.LifoQueue()
+        self._drivers = []
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def acquire(self):
+        """Take an idle driver, start a new one if below max_size, else wait for one"""
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_create = len(self._drivers) < self.max_size
+                if can_create:
+                    # Reserve the slot before the (slow) launch
+                    self._drivers.append(None)
+
+            if can_create:
+                return self._start_driver()
+
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                # A discarded driver may have freed a slot; check again
+                continue
+
+    def _start_driver(self):
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._drivers.remove(None)
+            raise
+
+        with self._lock:
+            self._drivers[self._drivers.index(None)] = driver
+        print(f"   🌐 Started pooled Chrome ({len(self._drivers)}/{self.max_size})")
+        return driver
+
+    def release(self, driver):
+        """Reset a driver and put it back, or discard it if it no longer responds"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            try:
+                # Clears cookies for every domain, not just the current one
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            except Exception:
+                driver.delete_all_cookies()
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+            driver.get("about:blank")
+        except Exception:
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def driver(self):
+        """Context manager form of acquire/release"""
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """Quit every driver the pool started"""
+        with self._lock:
+            drivers = [d for d in self._drivers if d is not None]
+            self._drivers = []
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
@@ -0,0 +1,161 @@
+"""
+Bulk Writer - chunked, parallel database writes with per-row outcomes
+
+Rows go out in size-bounded chunks, a few at a time; each chunk holds rows
+with the same fields, so no row overwrites a stored column it does not have.
+A chunk that fails with a transient error (timeout, connection reset, 5xx,
+deadlock) is retried with backoff. A chunk rejected for its data (a bad
+value, a constraint violation) is split in half and each half is tried on
+its own, down to single rows, so one bad row only costs itself and the good
+rows around it are still written. Any other failure (an outage that outlasts
+the retries, a missing column or unique index, bad credentials, a client
+that cannot be created) would fail every row the same way: the chunk fails
+as a whole and the remaining chunks are not sent.
+"""
+
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from metrics import get_metrics
+
+RowOutcome = namedtuple('RowOutcome', ['index', 'ok', 'error'])
+
+# Postgres SQLSTATE classes worth retrying: connection, resources, operator
+# intervention (statement timeout), transaction rollback (deadlock, serialization)
+TRANSIENT_SQLSTATE_PREFIXES = ('08', '53', '57', '40')
+
+# SQLSTATE classes that blame the rows themselves: cardinality (an upsert
+# touching a key twice), data exceptions and integrity constraint violations
+ROW_ERROR_SQLSTATE_PREFIXES = ('21', '22', '23')
+
+def default_chunk_size():
+    return int(os.getenv("SCRAPER_WRITE_CHUNK", "200"))
+
+def default_write_workers():
+    return int(os.getenv("SCRAPER_WRITE_WORKERS", "3"))
+
+def is_transient(error):
+    """Whether retrying the same rows could succeed"""
+    if isinstance(error, (httpx.TransportError, TimeoutError, ConnectionError)):
+        return True
+    code = str(getattr(error, 'code', '') or '')
+    return code.startswith(TRANSIENT_SQLSTATE_PREFIXES) or code.startswith('5')
+
+def is_row_error(error):
+    """Whether the error is about some of the rows, so the others could still be written"""
+    return str(getattr(error, 'code', '') or '').startswith(ROW_ERROR_SQLSTATE_PREFIXES)
+
+class WriteReport:
+    """Outcome of every row of a bulk write; truthy only if all rows were written"""
+
+    def __init__(self, total):
+        self.outcomes = [None] * total
+
+    @property
+    def written(self):
+        return sum(1 for outcome in self.outcomes if outcome and outcome.ok)
+
+    @property
+    def failures(self):
+        """[(row index, error)] for rows that could not be written"""
+        return [(o.index, o.error) for o in self.outcomes if o and not o.ok]
+
+    def __bool__(self):
+        return all(outcome and outcome.ok for outcome in self.outcomes)
+
+    def __len__(self):
+        return len(self.outcomes)
+
+def key_groups(rows):
+    """
+    Row indices grouped by the set of keys the row has, in first-seen order.
+
+    A bulk insert or upsert sends one column list for all of its rows, and
+    rows without one of those columns get NULL there, which on upsert
+    overwrites the stored value. Rows with different keys therefore go in
+    separate requests instead of being padded.
+    """
+    groups = {}
+    for i, row in enumerate(rows):
+        groups.setdefault(frozenset(row), []).append(i)
+    return list(groups.values())
+
+def bulk_write(rows, write_chunk, chunk_size=None, max_workers=None, retries=3, backoff=1.0, label='events'):
+    """
+    Write rows with `write_chunk(list_of_rows)`, which raises on failure.
+
+    Returns a WriteReport with one RowOutcome per input row. Round trips,
+    retries and failed rows are counted in the run metrics under `label`.
+    """
+    chunk_size = max(1, chunk_size or default_chunk_size())
+    report = WriteReport(len(rows))
+    metrics = get_metrics()
+    # First error that no other row would get past; once set, nothing more is sent
+    stopped = []
+    stop_lock = threading.Lock()
+
+    def fail(indices, error):
+        for i in indices:
+            report.outcomes[i] = RowOutcome(i, False, error)
+        metrics.count('db_failed_rows', label, len(indices))
+
+    def send(indices):
+        if stopped:
+            fail(indices, stopped[0])
+            return
+        error = None
+        for attempt in range(retries + 1):
+            if attempt:
+                metrics.count('db_retries', label)
+            metrics.count('db_round_trips', label)
+            try:
+                with metrics.timer('db_write', label):
+                    write_chunk([rows[i] for i in indices])
+                for i in indices:
+                    report.outcomes[i] = RowOutcome(i, True, None)
+                return
+            except Exception as e:
+                error = e
+                if not is_transient(e) or attempt == retries:
+                    break
+                time.sleep(backoff * (2 ** attempt) + random.uniform(0, backoff))
+
+        if not is_row_error(error):
+            with stop_lock:
+                if not stopped:
+                    stopped.append(error)
+                    print(f"   ❌ Writing {label} failed ({error}); not sending the rest")
+            fail(indices, error)
+            return
+        if len(indices) == 1:
+            fail(indices, error)
+            return
+        # Isolate the bad rows: try each half on its own
+        middle = len(indices) // 2
+        send(indices[:middle])
+        send(indices[middle:])
+
+    chunks = [group[start:start + chunk_size] for group in key_groups(rows)
+              for start in range(0, len(group), chunk_size)]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers or default_write_workers())) as executor:
+        list(executor.map(send, chunks))
+
+    return report
+
+def print_report(report, rows, label="events"):
+    """Print a one-line summary plus the first few failed rows"""
+    if report:
+        print(f"✅ Wrote {report.written} {label}")
+        return
+    failures = report.failures
+    print(f"❌ Wrote {report.written} of {len(report)} {label}; {len(failures)} failed")
+    for index, error in failures[:5]:
+        print(f"   • {str(rows[index].get('title', index))[:60]}: {error}")
+    if len(failures) > 5:
+        print(f"   … and {len(failures) - 5} more")
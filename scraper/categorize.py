@@ -0,0 +1,137 @@
+"""
+Event Categorization - shared keyword categorizer for all scrapers
+
+All keywords are compiled into one regex shaped like a prefix trie, so an
+event's text is scored in a single matching pass, and word boundaries keep
+short keywords like 'art' or 'run' from matching inside 'party' or
+'brunch'. categorize_events matches a whole batch of events in one pass.
+"""
+
+import re
+from bisect import bisect_right
+
+DEFAULT_CATEGORY = 'leisure'
+
+CATEGORY_KEYWORDS = {
+    'work': ['career', 'internship', 'job', 'recruitment', 'hiring', 'interview', 'resume',
+             'networking', 'professional', 'workshop', 'info session', 'infosession', 'tech talk',
+             'employer', 'company', 'startup', 'fair'],
+    'social': ['social', 'mixer', 'meet and greet', 'happy hour', 'party', 'celebration',
+               'gathering', 'BBQ', 'dinner', 'lunch', 'breakfast', 'food', 'free food',
+               'potluck', 'banquet', 'reception'],
+    'sports': ['sport', 'game', 'tournament', 'fitness', 'yoga', 'run', 'marathon',
+               'basketball', 'soccer', 'volleyball', 'tennis', 'recreation', 'athletic',
+               'intramural', 'competition', 'cal bears'],
+    'arts': ['art', 'music', 'concert', 'performance', 'theater', 'theatre', 'dance',
+             'exhibition', 'gallery', 'film', 'movie', 'poetry', 'cultural', 'show',
+             'screening', 'anime', 'cosplay', 'bampfa'],
+    'leisure': ['club meeting', 'general meeting', 'study', 'discussion', 'seminar',
+                'lecture', 'talk', 'presentation', 'fundraiser', 'volunteer', 'community',
+                'activism', 'awareness', 'scavenger hunt']
+}
+
+def _trie_pattern(phrases):
+    """
+    Alternation of `phrases` factored into a prefix trie ('fair|film|fitness'
+    becomes 'f(?:air|i(?:lm|tness))'), so each position of the text is
+    checked against every keyword at once; spaces match any whitespace.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [(r'\s+' if char == ' ' else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Greedy, so the longest keyword at a position wins ('free food' over 'free')
+        return f"(?:{pattern})?" if '' in node else pattern
+
+    return build(trie)
+
+def _compile(category_keywords):
+    """
+    Build the keyword regex and the table of what each match counts for.
+
+    Every keyword may take a plural 's'. A multi-word keyword also counts the
+    single-word keywords inside it ('tech talk' is 'work' and 'talk'), as if
+    its words had been matched one by one.
+    """
+    single = {}
+    phrases = {}
+    for category, words in category_keywords.items():
+        for word in words:
+            word = ' '.join(word.lower().split())
+            target = phrases if ' ' in word else single
+            target.setdefault(word, set()).add((category, word))
+
+    hits = {}
+    for word, categories in single.items():
+        for form in (word, word + 's'):
+            hits.setdefault(form, set()).update(categories)
+    for phrase, categories in phrases.items():
+        for form in (phrase, phrase + 's'):
+            found = set(categories)
+            for part in form.split():
+                found |= hits.get(part, set())
+            hits.setdefault(form, set()).update(found)
+
+    pattern = re.compile(rf"\b{_trie_pattern(list(single) + list(phrases))}s?\b")
+    return pattern, {form: frozenset(found) for form, found in hits.items()}
+
+_KEYWORD_RE, _HITS = _compile(CATEGORY_KEYWORDS)
+_CATEGORY_ORDER = list(CATEGORY_KEYWORDS)
+
+def _hits(match):
+    keyword = match.group()
+    return _HITS.get(keyword) or _HITS[' '.join(keyword.split())]
+
+def _scores(matched):
+    scores = {}
+    for category, _ in matched:
+        scores[category] = scores.get(category, 0) + 1
+    return scores
+
+def _best(scores):
+    if not scores:
+        return DEFAULT_CATEGORY
+    # Ties go to the category listed first, as before
+    return max(_CATEGORY_ORDER, key=lambda category: scores.get(category, 0))
+
+def score_text(text):
+    """Return {category: number of distinct keywords matched} for a piece of text"""
+    matched = set()
+    for match in _KEYWORD_RE.finditer(text.lower()):
+        matched |= _hits(match)
+    return _scores(matched)
+
+def categorize_event(title, description):
+    """Categorize event based on keywords in title and description"""
+    return _best(score_text(f"{title} {description or ''}"))
+
+def categorize_events(events):
+    """
+    Set 'category' on a batch of event dicts from their title and description.
+
+    The events' texts are joined (with a separator no keyword can span) and
+    matched in one pass; each match is credited to the event it falls in.
+    """
+    texts = [f"{event.get('title') or ''} {event.get('description') or ''}".lower() for event in events]
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + 1
+
+    matched = [set() for _ in events]
+    for match in _KEYWORD_RE.finditer('\0'.join(texts)):
+        matched[bisect_right(starts, match.start()) - 1] |= _hits(match)
+
+    for event, found in zip(events, matched):
+        event['category'] = _best(_scores(found))
+    return events
@@ -3,14 +3,13 @@ Selector Discovery Tool
 Run this locally to figure out the exact selectors for CalLink and Berkeley Events
 """
 
-import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+
+from driver_cache import start_chrome
+from readiness import wait_until_ready
 
 def setup_driver(headless=False):
     chrome_options = Options()
@@ -20,9 +19,7 @@ def setup_driver(headless=False):
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_argument('--window-size=1920,1080')
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
+    return start_chrome(chrome_options)
 
 def discover_selectors(url, site_name):
     """
@@ -36,8 +33,9 @@ def discover_selectors(url, site_name):
     driver.get(url)
     
     print(f"📍 URL: {url}")
-    print("⏳ Waiting 15 seconds for page to load...\n")
-    time.sleep(15)
+    print("⏳ Waiting for page to load...")
+    wait_until_ready(driver, "a[href]", timeout=30)
+    print()
     
     # Save HTML for inspection
     html_file = f"/tmp/{site_name.replace(' ', '_').lower()}.html"
@@ -0,0 +1,63 @@
+"""
+Bulk DOM Extraction - reads every event card in one WebDriver call
+
+Calling find_element / .text / get_attribute per card costs one WebDriver
+HTTP round trip each. extract_cards runs a single script in the page and
+returns plain dicts for all cards at once.
+
+extract_html returns the cards' markup instead, for callers that parse it
+with the same selectors they use on server-rendered pages.
+"""
+
+DEFAULT_TITLE_SELECTOR = "h2, h3, h4, .title, [class*='title']"
+DEFAULT_DESCRIPTION_SELECTOR = ".description, [class*='description'], p"
+
+_EXTRACT_JS = """
+const [selector, titleSelector, descriptionSelector, limit, start] = arguments;
+const text = el => (el && el.innerText ? el.innerText.trim() : '');
+
+function imageUrl(card) {
+    // background-image on div[role="img"] (CalLink), then plain <img> tags
+    for (const div of card.querySelectorAll('div[role="img"]')) {
+        const match = (div.getAttribute('style') || '').match(/url\\(["']?(https?:\\/\\/[^"')]+)["']?\\)/);
+        if (match) return match[1];
+    }
+    for (const img of card.querySelectorAll('img')) {
+        if (img.src && img.src.startsWith('http')) return img.src;
+    }
+    return null;
+}
+
+let cards = Array.from(document.querySelectorAll(selector)).slice(start || 0);
+if (limit) cards = cards.slice(0, limit);
+
+return cards.map(card => {
+    const titleEl = titleSelector ? card.querySelector(titleSelector) : null;
+    const link = card.tagName === 'A' ? card : card.querySelector('a');
+    return {
+        title: titleEl ? text(titleEl) : null,
+        url: link ? link.href : null,
+        description: descriptionSelector ? text(card.querySelector(descriptionSelector)) : '',
+        image_url: imageUrl(card),
+        text: text(card)
+    };
+});
+"""
+
+def extract_cards(driver, selector, title_selector=DEFAULT_TITLE_SELECTOR,
+                  description_selector=DEFAULT_DESCRIPTION_SELECTOR, limit=None, start=0):
+    """
+    Extract all cards matching `selector` with one in-page script.
+    `start` skips cards already read, e.g. before more were loaded by scrolling.
+
+    Returns a list of dicts with keys: title (None if no title element matched),
+    url (None if the card has no link), description, image_url and text (the
+    card's full visible text, for callers that fall back to it).
+    """
+    return driver.execute_script(_EXTRACT_JS, selector, title_selector, description_selector, limit, start) or []
+
+_HTML_JS = "return Array.from(document.querySelectorAll(arguments[0])).slice(arguments[1]).map(el => el.outerHTML);"
+
+def extract_html(driver, selector, start=0):
+    """outerHTML of every card matching `selector` from `start` on, in one call"""
+    return driver.execute_script(_HTML_JS, selector, start) or []
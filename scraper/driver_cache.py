@@ -0,0 +1,103 @@
+"""
+Chromedriver Cache - resolves chromedriver once and reuses the path on later runs
+
+Environment variables:
+  CHROMEDRIVER_PATH        use this driver binary, skip resolution entirely
+  CHROMEDRIVER_OFFLINE=1   never call ChromeDriverManager (cached path or PATH only)
+  CHROMEDRIVER_CACHE       cache file location
+  CHROMEDRIVER_CACHE_DAYS  re-resolve after this many days (default 7)
+"""
+
+import json
+import os
+import shutil
+import time
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import SessionNotCreatedException
+
+DEFAULT_CACHE_FILE = os.path.expanduser("~/.cache/berkeley-events/chromedriver.json")
+
+# Settings are read at call time so values from a .env loaded after import still apply
+def cache_file():
+    return os.getenv("CHROMEDRIVER_CACHE", DEFAULT_CACHE_FILE)
+
+def cache_max_age():
+    return float(os.getenv("CHROMEDRIVER_CACHE_DAYS", "7")) * 86400
+
+def is_offline():
+    return os.getenv("CHROMEDRIVER_OFFLINE", "").lower() in ("1", "true", "yes")
+
+def _read_cache():
+    try:
+        with open(cache_file(), encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.exists(entry.get('path', '')):
+        return None
+    return entry
+
+def _write_cache(path):
+    try:
+        os.makedirs(os.path.dirname(cache_file()), exist_ok=True)
+        with open(cache_file(), 'w', encoding='utf-8') as f:
+            json.dump({'path': path, 'resolved_at': time.time()}, f)
+    except OSError as e:
+        print(f"   ⚠️  Could not write chromedriver cache: {e}")
+
+def invalidate_cache():
+    """Forget the cached driver (e.g. after a Chrome upgrade made it incompatible)"""
+    try:
+        os.remove(cache_file())
+    except OSError:
+        pass
+
+def resolve_chromedriver():
+    """
+    Return the chromedriver path to use.
+
+    Order: CHROMEDRIVER_PATH, a fresh cache entry, then ChromeDriverManager
+    (skipped in offline mode, which also accepts a stale cache entry or a
+    chromedriver on PATH).
+    """
+    override = os.getenv("CHROMEDRIVER_PATH")
+    if override:
+        return override
+
+    entry = _read_cache()
+    if entry and (is_offline() or time.time() - entry['resolved_at'] < cache_max_age()):
+        return entry['path']
+
+    if is_offline():
+        path = shutil.which('chromedriver')
+        if not path:
+            raise RuntimeError("CHROMEDRIVER_OFFLINE is set but no cached or PATH chromedriver was found")
+        return path
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    path = ChromeDriverManager().install()
+    _write_cache(path)
+    return path
+
+def start_chrome(chrome_options):
+    """Start Chrome with a cached driver path and log how long startup took"""
+    started = time.perf_counter()
+    driver_path = resolve_chromedriver()
+    resolved = time.perf_counter()
+
+    try:
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    except SessionNotCreatedException:
+        # Cached driver no longer matches the installed Chrome; resolve again once
+        if os.getenv("CHROMEDRIVER_PATH") or is_offline():
+            raise
+        invalidate_cache()
+        driver_path = resolve_chromedriver()
+        resolved = time.perf_counter()
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+
+    finished = time.perf_counter()
+    print(f"   🚀 Chrome started in {finished - started:.2f}s "
+          f"(driver resolution {resolved - started:.2f}s, launch {finished - resolved:.2f}s)")
+    return driver
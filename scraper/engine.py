@@ -0,0 +1,331 @@
+"""
+Scrape Engine - runs every registered source through one implementation
+
+Sources (sources.py) only declare where their events are and which selectors
+find them; fetching, rendering, extraction and writing live here, so pooling,
+caching and batching apply to all of them alike:
+
+    api      - the source's feed adapter
+    static   - pages through the shared async fetcher, crawled with pagination.crawl
+    browser  - pooled headless Chrome, waited on with readiness, scrolled with
+               pagination.scroll_pages; the rendered cards are parsed with the
+               same selectors as static pages
+
+Every source streams into pipeline.run_pipeline:
+    python engine.py                                  # all sources, all their modes
+    python engine.py --source "Greek Theatre" --mode static
+    python engine.py --list
+"""
+
+import argparse
+import os
+import re
+import threading
+from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urljoin, urlparse
+
+import soupsieve
+from bs4 import BeautifulSoup
+from campus_events.dates import tokenize_date
+from dateutil import parser as date_parser
+from dotenv import load_dotenv
+
+from api_sources import to_timestamp
+from async_fetch import get_fetcher
+from browser_pool import DriverPool
+from dom_extract import extract_html
+from metrics import get_metrics
+from pagination import crawl, find_page_links, scroll_pages
+from pipeline import run_pipeline
+from readiness import wait_until_ready
+from sinks import make_sink
+from sources import MODES, REGISTRY, get_sources
+from state_store import StateStore
+
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Time of day assumed for listings that only give a date
+DEFAULT_EVENT_HOUR = 19
+
+_STYLE_URL = re.compile(r"url\([\"']?([^\"')]+)[\"']?\)")
+
+# Container selector that matched last time, per source
+_last_container = {}
+
+def default_modes():
+    """Render modes allowed by SCRAPER_MODE: 'auto' (each source's own order) or e.g. 'api,static'"""
+    mode = os.getenv("SCRAPER_MODE", "auto").lower()
+    if mode == 'auto':
+        return MODES
+    return tuple(m.strip() for m in mode.split(',') if m.strip())
+
+# --- Extraction (shared by static and browser modes) ---
+
+@lru_cache(maxsize=None)
+def compiled(selector):
+    return soupsieve.compile(selector)
+
+def parse_datetime(raw):
+    """
+    Listing date text (ISO or e.g. "May 3, 2026 7:00 pm") -> 'YYYY-MM-DD HH:MM:SS', or None
+
+    Tried in order: the date tokenizer scraper2 normalizes with (so both give
+    the same start time, and so the same fingerprint, for the same card), ISO
+    8601 with a UTC offset, then a fuzzy parse.
+    """
+    if not raw:
+        return None
+    timestamp = tokenize_date(raw, default_time=(DEFAULT_EVENT_HOUR, 0)) or to_timestamp(raw)
+    if timestamp:
+        return timestamp
+    default = datetime.now().replace(hour=DEFAULT_EVENT_HOUR, minute=0, second=0, microsecond=0)
+    try:
+        return to_timestamp(date_parser.parse(raw, default=default, fuzzy=True))
+    except (ValueError, OverflowError):
+        return None
+
+def read_field(card, selectors):
+    """First non-empty value the selectors give for one card (see sources.py for the syntax)"""
+    for spec in selectors:
+        selector, _, attr = spec.partition('@')
+        element = compiled(selector).select_one(card) if selector else card
+        if element is None:
+            continue
+        if attr:
+            value = element.get(attr)
+            if attr == 'style' and value:
+                match = _STYLE_URL.search(value)
+                value = match.group(1) if match else None
+        else:
+            value = element.get_text(' ', strip=True)
+        if value:
+            return value.strip()
+    return None
+
+def find_containers(source, soup):
+    """Event cards on a parsed page: the source's first container selector that matches"""
+    last = _last_container.get(source.name)
+    for selector in sorted(source.containers, key=lambda s: s != last):
+        cards = compiled(selector).select(soup)
+        if cards:
+            _last_container[source.name] = selector
+            return cards
+    return []
+
+def build_event(source, values, page_url):
+    """An event dict from one card's field values, or None if a required field is missing"""
+    values = {**source.defaults, **{field: value for field, value in values.items() if value}}
+    for field in ('start_time', 'end_time'):
+        values[field] = parse_datetime(values.get(field)) if isinstance(values.get(field), str) else values.get(field)
+    if any(not values.get(field) for field in source.required):
+        return None
+
+    description = values.get('description')
+    event = {
+        'title': values['title'][:200],
+        'description': description[:500] if description else None,
+        'category': values.get('category'),
+        'location': values.get('location') or "Berkeley, CA",
+        'source_url': urljoin(page_url, values.get('source_url') or page_url),
+        'scraped_at': datetime.now().isoformat()
+    }
+    if values.get('image_url'):
+        event['image_url'] = urljoin(page_url, values['image_url'])
+    for field in ('start_time', 'end_time', 'latitude', 'longitude', 'club_name'):
+        if values.get(field) is not None:
+            event[field] = values[field]
+    return event
+
+def events_from_cards(source, cards, page_url):
+    metrics = get_metrics()
+    metrics.count('cards', source.name, len(cards))
+    events = []
+    with metrics.timer('extract', source.name):
+        for card in cards:
+            try:
+                values = {field: read_field(card, selectors) for field, selectors in source.fields.items()}
+                event = build_event(source, values, page_url)
+            except Exception as e:
+                metrics.count('parse_failures', source.name)
+                print(f"   ⚠️  Error parsing {source.name} card: {e}")
+                continue
+            if event:
+                events.append(event)
+            else:
+                metrics.count('cards_dropped', source.name)
+    return events
+
+# --- Render modes: each returns an iterable of event pages ---
+
+def read_api(source):
+    return source.api()
+
+def read_static(source):
+    """Crawl the listing over HTTP, yielding each page's events"""
+    fetcher = get_fetcher()
+    if source.host_limit:
+        fetcher.set_host_limit(urlparse(source.url).netloc, source.host_limit)
+
+    def fetch_page(url):
+        response = fetcher.get(url)
+        response.raise_for_status()
+        with get_metrics().timer('parse', source.name):
+            soup = BeautifulSoup(response.content, 'lxml')
+        return events_from_cards(source, find_containers(source, soup), url), find_page_links(soup, url)
+
+    for _, events in crawl(source.url, fetch_page, max_pages=source.max_pages, max_workers=source.host_limit):
+        yield events
+
+def setup_driver():
+    """Headless Chrome for the browser mode"""
+    from selenium.webdriver.chrome.options import Options
+
+    from driver_cache import start_chrome
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument(f'user-agent={BROWSER_USER_AGENT}')
+    return start_chrome(chrome_options)
+
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+def get_driver_pool():
+    """Process-wide pool of Chrome drivers, shared by every browser-mode source"""
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = DriverPool(setup_driver)
+    return _driver_pool
+
+_FIRST_MATCH_JS = "return arguments[0].find(s => document.querySelector(s)) || null;"
+
+def save_debug(driver, source, label):
+    slug = source.slug
+    try:
+        driver.save_screenshot(f"/tmp/{slug}_{label}.png")
+        with open(f"/tmp/{slug}_{label}.html", 'w', encoding='utf-8') as f:
+            f.write(driver.page_source)
+        print(f"   📸 Saved /tmp/{slug}_{label}.png and .html")
+    except Exception:
+        pass
+
+def read_browser(source):
+    """Render the listing in Chrome, yielding events batch by batch as more cards load"""
+    pool = get_driver_pool()
+    driver = pool.acquire()
+    try:
+        metrics = get_metrics()
+        with metrics.timer('page_load', source.name):
+            driver.get(source.url)
+        waited, _ = wait_until_ready(driver, ', '.join(source.containers), endpoint=source.ready_endpoint)
+        metrics.observe('render_wait', source.name, waited)
+        selector = driver.execute_script(_FIRST_MATCH_JS, source.containers)
+        if not selector:
+            print(f"   ⚠️  No {source.name} cards found with known selectors")
+            save_debug(driver, source, 'debug')
+            return
+
+        for cards in scroll_pages(driver, selector, max_rounds=source.max_pages, extract=extract_html):
+            page_url = driver.current_url
+            # Each card's markup parsed on its own; the selector matches the card itself first
+            with metrics.timer('parse', source.name):
+                parsed = [BeautifulSoup(html, 'lxml') for html in cards]
+            yield events_from_cards(source, [compiled(selector).select_one(soup) or soup for soup in parsed],
+                                    page_url)
+    except Exception:
+        save_debug(driver, source, 'error')
+        raise
+    finally:
+        pool.release(driver)
+
+READERS = {'api': read_api, 'static': read_static, 'browser': read_browser}
+
+def scraper_for(source, modes=None):
+    """
+    A function returning the source's event pages for run_pipeline.
+
+    The source's modes (limited to `modes`) are tried in order; the next one
+    runs only if the last failed or found nothing before yielding. A failure
+    after events were yielded is raised, so the source's watermark stays put.
+    """
+    allowed = [mode for mode in source.modes if mode in (modes or default_modes())]
+
+    def scrape():
+        error = None
+        for mode in allowed:
+            print(f"🔍 {source.name}: reading {mode} ({source.url})...")
+            found = 0
+            try:
+                for events in READERS[mode](source):
+                    found += len(events)
+                    yield events
+            except Exception as e:
+                if found:
+                    raise
+                error = e
+                print(f"   ❌ {source.name} {mode} failed: {e}")
+                continue
+            if found:
+                print(f"   ✅ {found} events from {source.name} ({mode})")
+                return
+            error = None
+            print(f"   ↩️  No {source.name} events from {mode}")
+        if error:
+            raise error
+    return scrape
+
+def run(names=None, modes=None, sink=None, state=None, flush_size=None):
+    """
+    Scrape the named (default: all) sources into `sink` (default: make_sink()).
+
+    modes: render modes to allow (default: all); SCRAPER_MODE narrows them further.
+    Returns the PipelineStats.
+    """
+    modes = tuple(mode for mode in (modes or MODES) if mode in default_modes())
+    sources = {}
+    for source in get_sources(names):
+        if any(mode in modes for mode in source.modes):
+            sources[source.name] = scraper_for(source, modes)
+        else:
+            print(f"⏭️  Skipping {source.name}: none of its modes {source.modes} allowed")
+    return run_pipeline(sources, sink or make_sink(), state=state, flush_size=flush_size)
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape the registered event sources")
+    parser.add_argument('--source', action='append', help="Source name (repeatable; default: all)")
+    parser.add_argument('--mode', help="Comma-separated render modes to allow (default: all; SCRAPER_MODE narrows them)")
+    parser.add_argument('--sink', help="Sink spec (default: SCRAPER_SINK or supabase)")
+    parser.add_argument('--all', action='store_true', help="Write every event, not only new or changed ones")
+    parser.add_argument('--list', action='store_true', help="List the registered sources and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for source in REGISTRY.values():
+            print(f"{source.name:20} {', '.join(source.modes):24} {source.url}")
+        return
+
+    # Load environment variables at run time, not on import
+    load_dotenv()
+
+    print("\n" + "="*50)
+    print("🎓 Berkeley Events Scraper")
+    print(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*50 + "\n")
+
+    modes = tuple(m.strip() for m in args.mode.split(',')) if args.mode else None
+    stats = run(args.source, modes=modes, sink=make_sink(args.sink),
+                state=None if args.all else StateStore())
+
+    if stats.scraped:
+        print("\n✅ Scraping complete!\n")
+    else:
+        print("\n⚠️  No events found\n")
+
+if __name__ == "__main__":
+    main()
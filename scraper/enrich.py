@@ -0,0 +1,173 @@
+"""
+Detail Enrichment - fills in what listing cards leave out from each event's own page
+
+Listing cards carry a title and a snippet; the page behind source_url usually
+has the full description, end time, venue and often coordinates (schema.org
+Event JSON-LD, with OpenGraph / geo meta tags as a fallback). Detail pages are
+fetched concurrently through the shared async fetcher and cached in the state
+store by URL with their ETag / Last-Modified, so a repeat visit is a
+conditional request and an unchanged page is not parsed again.
+
+Enabled with SCRAPER_ENRICH=1; callers pass only new or changed events.
+"""
+
+import json
+import os
+import re
+from collections import Counter
+
+from bs4 import BeautifulSoup
+
+from api_sources import html_to_text, to_timestamp
+from async_fetch import get_fetcher
+
+# Locations the listing scrapers fall back to when a card has none
+PLACEHOLDER_LOCATIONS = {None, '', 'TBA', 'Berkeley, CA'}
+
+def enrich_enabled():
+    return os.getenv("SCRAPER_ENRICH", "0") == "1"
+
+def _json_ld_events(soup):
+    """schema.org Event objects from JSON-LD blocks (including @graph lists)"""
+    found = []
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or '')
+        except ValueError:
+            continue
+        stack = data if isinstance(data, list) else [data]
+        while stack:
+            item = stack.pop()
+            if not isinstance(item, dict):
+                continue
+            stack.extend(item.get('@graph') or [])
+            types = item.get('@type')
+            types = types if isinstance(types, list) else [types]
+            if any(isinstance(t, str) and t.endswith('Event') for t in types):
+                found.append(item)
+    return found
+
+def _meta(soup, *names):
+    for name in names:
+        tag = soup.find('meta', attrs={'property': name}) or soup.find('meta', attrs={'name': name})
+        if tag and tag.get('content'):
+            return tag['content'].strip()
+    return None
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def parse_detail_page(html):
+    """Pull description, times, location, coordinates and organizer out of an event page"""
+    soup = BeautifulSoup(html, 'lxml')
+    details = {}
+
+    for item in _json_ld_events(soup)[:1]:
+        details['description'] = html_to_text(item.get('description'))
+        details['start_time'] = to_timestamp(item.get('startDate'))
+        details['end_time'] = to_timestamp(item.get('endDate'))
+
+        location = item.get('location')
+        location = location[0] if isinstance(location, list) and location else location
+        if isinstance(location, dict):
+            address = location.get('address')
+            if isinstance(address, dict):
+                address = ', '.join(filter(None, [address.get('streetAddress'), address.get('addressLocality')]))
+            details['location'] = ', '.join(filter(None, [location.get('name'), address])) or None
+            geo = location.get('geo') or {}
+            details['latitude'] = _float(geo.get('latitude'))
+            details['longitude'] = _float(geo.get('longitude'))
+        elif isinstance(location, str):
+            details['location'] = location
+
+        organizer = item.get('organizer')
+        organizer = organizer[0] if isinstance(organizer, list) and organizer else organizer
+        if isinstance(organizer, dict):
+            details['club_name'] = organizer.get('name')
+
+        image = item.get('image')
+        image = image[0] if isinstance(image, list) and image else image
+        details['image_url'] = image.get('url') if isinstance(image, dict) else image
+
+    if not details.get('description'):
+        details['description'] = _meta(soup, 'og:description', 'description')
+    if not details.get('image_url'):
+        details['image_url'] = _meta(soup, 'og:image')
+    if details.get('latitude') is None:
+        position = _meta(soup, 'geo.position', 'ICBM')
+        if position and re.match(r'^-?[\d.]+\s*[;,]\s*-?[\d.]+$', position):
+            lat, lng = re.split(r'\s*[;,]\s*', position)
+            details['latitude'], details['longitude'] = _float(lat), _float(lng)
+        else:
+            details['latitude'] = _float(_meta(soup, 'place:location:latitude'))
+            details['longitude'] = _float(_meta(soup, 'place:location:longitude'))
+
+    return {key: value for key, value in details.items() if value not in (None, '')}
+
+def merge_details(event, details):
+    """A copy of the event with gaps filled from its detail page (the listing's own values win otherwise)"""
+    merged = dict(event)
+    description = details.get('description')
+    if description and len(description) > len(event.get('description') or ''):
+        merged['description'] = description
+    if event.get('location') in PLACEHOLDER_LOCATIONS and details.get('location'):
+        merged['location'] = details['location']
+    for field in ('start_time', 'end_time', 'latitude', 'longitude', 'club_name', 'image_url'):
+        if event.get(field) is None and details.get(field) is not None:
+            merged[field] = details[field]
+    return merged
+
+def enrich_events(events, state):
+    """
+    Return copies of `events` filled in from their detail pages.
+
+    Copies are returned so the listing-level dicts (what the state store
+    hashes to spot changes) stay as scraped. Events without a page of their
+    own - a source_url shared by several events is a listing fallback -
+    are passed through unchanged.
+    """
+    url_counts = Counter(event.get('source_url') for event in events)
+    urls = [url for url, count in url_counts.items()
+            if url and count == 1 and url.startswith('http')]
+    if not urls:
+        return list(events)
+
+    print(f"\n🔎 Enriching {len(urls)} events from their detail pages...")
+    cached = state.cached_details(urls)
+    validators = {}
+    for url, page in cached.items():
+        headers = {}
+        if page['etag']:
+            headers['If-None-Match'] = page['etag']
+        if page['last_modified']:
+            headers['If-Modified-Since'] = page['last_modified']
+        validators[url] = headers
+
+    pages = {}
+    fresh = {}
+    reused = failed = 0
+    for url, response in zip(urls, get_fetcher().get_many(urls, headers_by_url=validators)):
+        if isinstance(response, Exception) or (response.status_code != 304 and not response.is_success):
+            failed += 1
+            if url in cached:
+                pages[url] = cached[url]['details']
+            continue
+        if response.status_code == 304 and url in cached:
+            reused += 1
+            pages[url] = cached[url]['details']
+            continue
+        details = parse_detail_page(response.text)
+        pages[url] = details
+        fresh[url] = {'etag': response.headers.get('ETag'),
+                      'last_modified': response.headers.get('Last-Modified'),
+                      'details': details}
+
+    if fresh:
+        state.save_details(fresh)
+    print(f"   ✅ {len(fresh)} fetched, {reused} unchanged (304), {failed} failed")
+
+    return [merge_details(event, pages[event['source_url']]) if event.get('source_url') in pages else event
+            for event in events]
@@ -0,0 +1,198 @@
+"""
+Run Metrics - where a scrape run spends its time, per stage and per source
+
+Stages and layers record into one process-wide RunMetrics:
+
+    timings   - histograms of seconds per (stage, source): fetch, page_load,
+                render_wait, parse, extract, normalize, categorize, dedup,
+                changed_only, enrich, flush, db_write, source (a whole scrape)
+    counters  - totals per (name, source): requests, bytes, retries, http_errors,
+                cards, cards_dropped, parse_failures, db_round_trips,
+                db_retries, db_failed_rows
+
+"source" is the source name where the stage knows it, else the host (fetches)
+or the table (database writes). run_pipeline starts a fresh run and, when it
+finishes, writes a JSON report (SCRAPER_METRICS_JSON, default
+scrape_report.json next to this module; "" to skip) and, if SCRAPER_METRICS_PROM is set, a
+Prometheus text file for node_exporter's textfile collector.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+DEFAULT_REPORT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scrape_report.json')
+
+def default_report_path():
+    return os.getenv("SCRAPER_METRICS_JSON", DEFAULT_REPORT_PATH)
+
+def default_prometheus_path():
+    return os.getenv("SCRAPER_METRICS_PROM") or None
+
+class Histogram:
+    """Count, sum, max and cumulative-bucket counts of observed durations"""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'max': round(self.max, 6),
+            'buckets': {str(bound): n for bound, n in zip(BUCKETS, self.buckets)},
+        }
+
+class RunMetrics:
+    """Timings and counters for one run; safe to record into from any thread"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.finished = None
+        self.timings = defaultdict(Histogram)
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def observe(self, stage, source, seconds):
+        with self._lock:
+            self.timings[(stage, source or 'all')].observe(seconds)
+
+    @contextmanager
+    def timer(self, stage, source=None):
+        """Time the body of a with block as one observation of `stage`"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, source, time.perf_counter() - started)
+
+    def count(self, name, source=None, amount=1):
+        with self._lock:
+            self.counters[(name, source or 'all')] += amount
+
+    def report(self, stats=None):
+        """The run as a JSON-serializable dict (with the PipelineStats, if given)"""
+        with self._lock:
+            timings = defaultdict(dict)
+            for (stage, source), histogram in sorted(self.timings.items()):
+                timings[stage][source] = histogram.to_dict()
+            counters = defaultdict(dict)
+            for (name, source), value in sorted(self.counters.items()):
+                counters[name][source] = value
+
+        finished = self.finished or time.time()
+        report = {
+            'started_at': datetime.fromtimestamp(self.started).isoformat(),
+            'finished_at': datetime.fromtimestamp(finished).isoformat(),
+            'duration_seconds': round(finished - self.started, 3),
+            'timings': timings,
+            'counters': counters,
+        }
+        if stats is not None:
+            report['pipeline'] = {
+                'scraped': dict(stats.scraped),
+                'new': dict(stats.new),
+                'changed': dict(stats.changed),
+                'unchanged': dict(stats.unchanged),
+                'duplicates': dict(stats.duplicates),
+                'categories': dict(stats.categories),
+                'source_errors': {name: str(error) for name, error in stats.source_errors.items()},
+                'written': stats.written,
+                'failed': stats.failed,
+                'first_write_seconds': stats.first_write_seconds,
+            }
+        return report
+
+    def prometheus(self, stats=None):
+        """The run in Prometheus text exposition format"""
+        lines = ['# HELP scraper_stage_seconds Time spent per stage and source in the last run',
+                 '# TYPE scraper_stage_seconds histogram']
+        with self._lock:
+            for (stage, source), histogram in sorted(self.timings.items()):
+                labels = f'stage="{_label(stage)}",source="{_label(source)}"'
+                for bound, n in zip(BUCKETS, histogram.buckets):
+                    lines.append(f'scraper_stage_seconds_bucket{{{labels},le="{bound}"}} {n}')
+                lines.append(f'scraper_stage_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f'scraper_stage_seconds_sum{{{labels}}} {histogram.sum:.6f}')
+                lines.append(f'scraper_stage_seconds_count{{{labels}}} {histogram.count}')
+
+            names = sorted({name for name, _ in self.counters})
+            for name in names:
+                lines.append(f'# TYPE scraper_{name}_total counter')
+                for (counter, source), value in sorted(self.counters.items()):
+                    if counter == name:
+                        lines.append(f'scraper_{name}_total{{source="{_label(source)}"}} {value}')
+
+        finished = self.finished or time.time()
+        lines += ['# TYPE scraper_run_duration_seconds gauge',
+                  f'scraper_run_duration_seconds {finished - self.started:.3f}',
+                  '# TYPE scraper_run_finished_timestamp_seconds gauge',
+                  f'scraper_run_finished_timestamp_seconds {finished:.0f}']
+        if stats is not None:
+            lines.append('# TYPE scraper_events_scraped gauge')
+            lines += [f'scraper_events_scraped{{source="{_label(source)}"}} {count}'
+                      for source, count in sorted(stats.scraped.items())]
+            lines += ['# TYPE scraper_events_written gauge', f'scraper_events_written {stats.written}',
+                      '# TYPE scraper_events_failed gauge', f'scraper_events_failed {stats.failed}']
+        return '\n'.join(lines) + '\n'
+
+    def finish(self, stats=None, report_path=None, prometheus_path=None):
+        """Close the run and write the JSON report / Prometheus file; returns the report dict"""
+        self.finished = time.time()
+        report = self.report(stats)
+        report_path = default_report_path() if report_path is None else report_path
+        prometheus_path = prometheus_path or default_prometheus_path()
+        slowest = sorted(((h.sum, stage, source) for (stage, source), h in self.timings.items()
+                          if stage != 'source'), reverse=True)[:3]
+        if slowest:
+            print("⏱️  Most time: " + ", ".join(f"{stage}/{source} {seconds:.1f}s"
+                                               for seconds, stage, source in slowest))
+        if report_path:
+            write_atomic(report_path, json.dumps(report, indent=2, default=str))
+            print(f"📈 Run report: {report_path}")
+        if prometheus_path:
+            write_atomic(prometheus_path, self.prometheus(stats))
+        return report
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def write_atomic(path, text):
+    """Write via a temporary file, so readers never see half a file"""
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+_metrics = RunMetrics()
+_metrics_lock = threading.Lock()
+
+def get_metrics():
+    """The RunMetrics of the current run"""
+    return _metrics
+
+def start_run():
+    """Begin a new run's metrics (the previous run's are dropped) and return them"""
+    global _metrics
+    with _metrics_lock:
+        _metrics = RunMetrics()
+    return _metrics
@@ -0,0 +1,142 @@
+"""
+Pagination - crawls every listing page instead of stopping at the first one
+
+crawl() follows next-page / numbered page links of server-rendered listings,
+fetching up to a few pages at once and handing each page's cards back as soon
+as it arrives. scroll_pages() does the same for browser-rendered listings that
+grow through infinite scroll or a "Load more" button.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urldefrag, urljoin, urlparse
+
+from dom_extract import DEFAULT_DESCRIPTION_SELECTOR, DEFAULT_TITLE_SELECTOR, extract_cards
+
+# Links that lead to further pages of the same listing
+PAGE_LINK_SELECTOR = ("a[rel~='next'], link[rel~='next'], .pagination a[href], .pager a[href], "
+                      "[class*='pagination'] a[href], nav[aria-label*='agination'] a[href], "
+                      "a[class*='next'][href]")
+
+# Button labels that load another batch of cards in place
+LOAD_MORE_TEXTS = ['load more', 'show more', 'more events', 'view more']
+
+def default_max_pages():
+    """Upper bound on pages (or scroll rounds) per source"""
+    return int(os.getenv("SCRAPER_MAX_PAGES", "25"))
+
+def default_page_workers():
+    """How many pages of one source may be fetched at once"""
+    return int(os.getenv("SCRAPER_PAGE_WORKERS", "4"))
+
+def find_page_links(soup, page_url):
+    """Absolute URLs of further listing pages linked from a parsed page (same host only)"""
+    host = urlparse(page_url).netloc
+    links = []
+    for link in soup.select(PAGE_LINK_SELECTOR):
+        href = link.get('href')
+        if not href or href.startswith(('#', 'javascript:')):
+            continue
+        url = urldefrag(urljoin(page_url, href))[0]
+        if urlparse(url).netloc == host and url not in links:
+            links.append(url)
+    return links
+
+def crawl(start_url, fetch_page, max_pages=None, max_workers=None):
+    """
+    Crawl a paginated listing, yielding (page_url, cards) as each page finishes.
+
+    fetch_page: function(url) -> (cards, urls of further pages to visit)
+    Every URL is fetched at most once, at most `max_pages` in total and at
+    most `max_workers` at a time. A failed page is reported and skipped.
+    """
+    max_pages = max_pages or default_max_pages()
+    seen = set()
+    pending = deque()
+    pages = 0
+
+    def enqueue(urls):
+        for url in urls:
+            url = urldefrag(url)[0]
+            if url not in seen and len(seen) < max_pages:
+                seen.add(url)
+                pending.append(url)
+
+    workers = max(1, max_workers or default_page_workers())
+    enqueue([start_url])
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        while pending or running:
+            while pending and len(running) < workers:
+                url = pending.popleft()
+                running[executor.submit(fetch_page, url)] = url
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = running.pop(future)
+                try:
+                    cards, next_urls = future.result()
+                except Exception as e:
+                    print(f"   ⚠️  Skipping page {url}: {e}")
+                    continue
+                pages += 1
+                enqueue(next_urls or [])
+                yield url, cards
+
+    print(f"   📄 Crawled {pages} page(s)" + (" (page limit reached)" if len(seen) >= max_pages else ""))
+
+_ADVANCE_JS = """
+const loadMoreTexts = arguments[0];
+for (const el of document.querySelectorAll('button, a[role="button"], [class*="load-more"], [class*="loadMore"]')) {
+    const label = (el.innerText || el.value || '').trim().toLowerCase();
+    if (!el.disabled && el.offsetParent !== null && loadMoreTexts.some(text => label.includes(text))) {
+        el.scrollIntoView({block: 'center'});
+        el.click();
+        return 'clicked';
+    }
+}
+window.scrollTo(0, document.body.scrollHeight);
+return 'scrolled';
+"""
+
+_COUNT_JS = "return document.querySelectorAll(arguments[0]).length;"
+
+def scroll_pages(driver, selector, title_selector=DEFAULT_TITLE_SELECTOR,
+                 description_selector=DEFAULT_DESCRIPTION_SELECTOR, max_rounds=None,
+                 timeout=8, poll=0.25, extract=None):
+    """
+    Yield batches of cards from a browser page that loads more as you scroll.
+
+    Each round reads only the cards added since the last one, then clicks a
+    "Load more" button (or scrolls to the bottom) and waits up to `timeout`
+    seconds for new `selector` matches. Stops when nothing new appears or
+    after `max_rounds` rounds.
+
+    extract: function(driver, selector, start) returning the cards from
+    index `start` on; defaults to dom_extract.extract_cards with the given
+    title / description selectors.
+    """
+    max_rounds = max_rounds or default_max_pages()
+    read = 0
+
+    for round_number in range(1, max_rounds + 1):
+        if extract:
+            cards = extract(driver, selector, start=read)
+        else:
+            cards = extract_cards(driver, selector, title_selector, description_selector, start=read)
+        if cards:
+            read += len(cards)
+            yield cards
+        if round_number == max_rounds:
+            print(f"   📄 Stopped after {max_rounds} load rounds ({read} cards)")
+            return
+
+        driver.execute_script(_ADVANCE_JS, LOAD_MORE_TEXTS)
+        deadline = time.perf_counter() + timeout
+        while driver.execute_script(_COUNT_JS, selector) <= read:
+            if time.perf_counter() >= deadline:
+                print(f"   📄 Loaded {round_number} round(s), {read} cards")
+                return
+            time.sleep(poll)
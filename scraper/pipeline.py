@@ -0,0 +1,272 @@
+"""
+Streaming Pipeline - moves events from the sources to the sink page by page
+
+Sources run concurrently and hand over each page of events as soon as it is
+scraped. Every stage is a generator over Batch(source, events, seen):
+
+    sources -> normalize -> categorize -> dedup -> changed only -> enrich -> sink
+
+Each stage's time per source is recorded in the run metrics (metrics.py),
+which are written out as a run report when the pipeline finishes.
+
+A bounded queue between the source threads and the stages gives
+backpressure (a fast source waits instead of piling pages up in memory), and
+the sink is flushed every `flush_size` events, so the first events land
+within seconds and a failed flush costs only that chunk.
+"""
+
+import os
+import queue
+import time
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+from campus_events.identity import event_fingerprint, event_key
+
+from browser_pool import default_max_workers
+from categorize import categorize_events
+from enrich import enrich_enabled, enrich_events
+from metrics import get_metrics, start_run
+from state_store import content_hash
+
+# events: what flows on to the sink
+# seen: (event key, content hash) rows to record once the batch is written
+Batch = namedtuple('Batch', ['source', 'events', 'seen'])
+
+def default_flush_size():
+    """How many events are buffered before the sink is called"""
+    return int(os.getenv("SCRAPER_FLUSH_SIZE", "100"))
+
+class PipelineStats:
+    """Counters filled in by the stages, printed by summary()"""
+
+    def __init__(self):
+        self.scraped = Counter()
+        self.categories = Counter()
+        self.duplicates = Counter()
+        self.new = Counter()
+        self.changed = Counter()
+        self.unchanged = Counter()
+        self.source_errors = {}
+        self.written = 0
+        self.failed = 0
+        self.first_write_seconds = None
+
+    def summary(self):
+        print(f"\n📊 Total events scraped: {sum(self.scraped.values())}")
+        for source, count in self.scraped.items():
+            print(f"   - {source}: {count}"
+                  + (f" ({self.new[source]} new, {self.changed[source]} changed, "
+                     f"{self.unchanged[source]} unchanged)" if source in self.new or source in self.unchanged else ""))
+        if self.duplicates:
+            print(f"   - repeated cards dropped: {sum(self.duplicates.values())}")
+        if self.categories:
+            print("\n📂 Category breakdown:")
+            for category, count in sorted(self.categories.items()):
+                print(f"   - {category}: {count}")
+        print(f"\n📤 Written: {self.written}, failed: {self.failed}"
+              + (f" (first write after {self.first_write_seconds:.1f}s)" if self.first_write_seconds else ""))
+
+_SOURCE_DONE = object()
+
+def source_batches(sources, stats, max_workers=None, queue_size=8):
+    """
+    Run sources concurrently, yielding a Batch for every page they produce.
+
+    sources: dict of source name -> function returning an iterable of event lists
+    At most `queue_size` pages wait between the sources and the stages; a
+    source that gets ahead blocks until the stages catch up.
+    """
+    pages = queue.Queue(maxsize=queue_size)
+    stop = Event()
+    started = time.perf_counter()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(name, scrape):
+        source_start = time.perf_counter()
+        count = 0
+        error = None
+        try:
+            batches = scrape()
+            for events in batches:
+                count += len(events)
+                if events and not put(Batch(name, list(events), [])):
+                    break
+        except Exception as e:
+            error = e
+        finally:
+            put((_SOURCE_DONE, name, count, time.perf_counter() - source_start, error))
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers or default_max_workers())) as executor:
+        for name, scrape in sources.items():
+            executor.submit(produce, name, scrape)
+
+        remaining = len(sources)
+        try:
+            while remaining:
+                item = pages.get()
+                if isinstance(item, Batch):
+                    yield item
+                    continue
+                _, name, count, seconds, error = item
+                remaining -= 1
+                get_metrics().observe('source', name, seconds)
+                if error:
+                    stats.source_errors[name] = error
+                    print(f"   ❌ {name} failed after {seconds:.1f}s: {error}")
+                else:
+                    print(f"   ⏱️  {name}: {count} events in {seconds:.1f}s")
+        finally:
+            # Unblock producers if the consumer stopped early
+            stop.set()
+
+    print(f"   ⏱️  All sources finished in {time.perf_counter() - started:.1f}s")
+
+def normalize(batches, stats):
+    """Tidy titles, drop untitled cards and attach the upsert fingerprint"""
+    metrics = get_metrics()
+    for batch in batches:
+        with metrics.timer('normalize', batch.source):
+            events = []
+            for event in batch.events:
+                title = ' '.join((event.get('title') or '').split())
+                if len(title) <= 3:
+                    continue
+                event['title'] = title[:200]
+                event['fingerprint'] = event_fingerprint(batch.source, event)
+                events.append(event)
+            stats.scraped[batch.source] += len(events)
+        yield batch._replace(events=events)
+
+def categorize(batches, stats):
+    """Categorize events the scraper did not already categorize"""
+    metrics = get_metrics()
+    for batch in batches:
+        with metrics.timer('categorize', batch.source):
+            categorize_events([event for event in batch.events if not event.get('category')])
+            stats.categories.update(event['category'] for event in batch.events)
+        yield batch
+
+def dedup(batches, stats):
+    """Drop events already seen earlier in this run (e.g. a card repeated on several pages)"""
+    seen = defaultdict(set)
+    metrics = get_metrics()
+    for batch in batches:
+        with metrics.timer('dedup', batch.source):
+            events = []
+            for event in batch.events:
+                key = event_key(batch.source, event)
+                if key in seen[batch.source]:
+                    stats.duplicates[batch.source] += 1
+                    continue
+                seen[batch.source].add(key)
+                events.append(event)
+        yield batch._replace(events=events)
+
+def changed_only(batches, stats, state):
+    """Pass on only events that are new or changed since the last recorded run"""
+    known = {}
+    metrics = get_metrics()
+    for batch in batches:
+        with metrics.timer('changed_only', batch.source):
+            if batch.source not in known:
+                known[batch.source] = state.known_hashes(batch.source)
+            diff = state.diff(batch.source, batch.events, known=known[batch.source])
+            stats.new[batch.source] += len(diff.new)
+            stats.changed[batch.source] += len(diff.changed)
+            stats.unchanged[batch.source] += len(diff.unchanged)
+            # Hash the listing data now, before enrichment adds to it
+            seen = [(event_key(batch.source, e), content_hash(e)) for e in batch.events]
+        yield Batch(batch.source, diff.new + diff.changed, batch.seen + seen)
+
+def enrich(batches, stats, state):
+    """Fill in each batch from its events' detail pages"""
+    metrics = get_metrics()
+    for batch in batches:
+        if not batch.events:
+            yield batch
+            continue
+        with metrics.timer('enrich', batch.source):
+            events = enrich_events(batch.events, state)
+        yield batch._replace(events=events)
+
+def write(batches, stats, sink, state=None, flush_size=None):
+    """
+    Flush events to `sink` (function(events) -> truthy on success) every `flush_size` events.
+
+    After a successful flush the batches' seen rows are recorded in the state
+    store; a source's watermark moves only if it finished without error and
+    all of its flushes succeeded.
+    """
+    flush_size = flush_size or default_flush_size()
+    started = time.perf_counter()
+    pending = []
+    pending_seen = defaultdict(list)
+    seen_counts = Counter()
+    failed_sources = set()
+
+    def flush():
+        sources = set(pending_seen) | {source for source, _ in pending}
+        events = [event for _, event in pending]
+        with get_metrics().timer('flush'):
+            result = sink(events) if events else True
+        # A sink may return a bulk_writer.WriteReport with per-row outcomes
+        failed = len(result.failures) if hasattr(result, 'failures') else (0 if result else len(events))
+        stats.written += len(events) - failed
+        stats.failed += failed
+        if events and failed < len(events) and stats.first_write_seconds is None:
+            stats.first_write_seconds = time.perf_counter() - started
+        if result:
+            if state:
+                for source, rows in pending_seen.items():
+                    state.record_seen(source, rows)
+        else:
+            # Not recorded as seen, so the next run offers these events again
+            failed_sources.update(sources)
+        pending.clear()
+        pending_seen.clear()
+
+    for batch in batches:
+        pending.extend((batch.source, event) for event in batch.events)
+        pending_seen[batch.source].extend(batch.seen)
+        seen_counts[batch.source] += len(batch.seen)
+        if len(pending) >= flush_size:
+            flush()
+    flush()
+
+    if state:
+        for source, count in seen_counts.items():
+            if source not in failed_sources and source not in stats.source_errors:
+                state.mark_source(source, count)
+
+def run_pipeline(sources, sink, state=None, flush_size=None, max_workers=None):
+    """
+    Stream every source through the stages into `sink` and return the PipelineStats.
+
+    With a state store only new or changed events reach the sink (and are
+    enriched first when SCRAPER_ENRICH=1); without one every event does.
+    The run's metrics are written to the report files (see metrics.py).
+    """
+    metrics = start_run()
+    stats = PipelineStats()
+    batches = source_batches(sources, stats, max_workers=max_workers)
+    batches = normalize(batches, stats)
+    batches = categorize(batches, stats)
+    batches = dedup(batches, stats)
+    if state:
+        batches = changed_only(batches, stats, state)
+        if enrich_enabled():
+            batches = enrich(batches, stats, state)
+    write(batches, stats, sink, state=state, flush_size=flush_size)
+    stats.summary()
+    metrics.finish(stats)
+    return stats
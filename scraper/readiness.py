@@ -0,0 +1,59 @@
+"""
+Page Readiness - waits for concrete signals instead of fixed sleeps
+"""
+
+import time
+
+# One round trip per poll: document state, matching element count, network activity
+_PROBE_JS = """
+const selector = arguments[0];
+const endpoint = arguments[1];
+const resources = performance.getEntriesByType('resource');
+return {
+    complete: document.readyState === 'complete',
+    count: selector ? document.querySelectorAll(selector).length : 0,
+    resources: resources.length,
+    endpointSeen: endpoint ? resources.some(r => r.name.includes(endpoint)) : true
+};
+"""
+
+def wait_until_ready(driver, selector, endpoint=None, timeout=20, settle=1.0, poll=0.25):
+    """
+    Wait until the page is ready to scrape, or until `timeout` seconds pass.
+
+    Ready means: the document has loaded, the data endpoint (if given) has been
+    requested, at least one `selector` match exists, and neither the match count
+    nor the number of network requests has changed for `settle` seconds.
+
+    Returns (seconds waited, number of matching elements)
+    """
+    started = time.perf_counter()
+    last_state = None
+    stable_since = started
+    probe = {'count': 0}
+
+    while True:
+        now = time.perf_counter()
+        try:
+            probe = driver.execute_script(_PROBE_JS, selector, endpoint)
+        except Exception:
+            # Page is mid-navigation; try again on the next poll
+            probe = {'complete': False, 'count': 0, 'resources': -1, 'endpointSeen': False}
+
+        state = (probe['count'], probe['resources'])
+        if state != last_state:
+            last_state = state
+            stable_since = now
+
+        if (probe['complete'] and probe['endpointSeen'] and probe['count'] > 0
+                and now - stable_since >= settle):
+            elapsed = now - started
+            print(f"   ⚡ Page ready in {elapsed:.1f}s ({probe['count']} elements)")
+            return elapsed, probe['count']
+
+        if now - started >= timeout:
+            elapsed = now - started
+            print(f"   ⚠️  Page not settled after {elapsed:.1f}s ({probe['count']} elements), continuing")
+            return elapsed, probe['count']
+
+        time.sleep(poll)
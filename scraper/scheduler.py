@@ -0,0 +1,226 @@
+"""
+Scheduler - a long-running process that scrapes each source on its own interval
+
+Instead of cron starting a fresh interpreter (and a fresh Chrome, HTTP pool
+and Supabase client) every hour, one process stays up and keeps them warm:
+the shared async fetcher, the engine's Chrome pool, the sink's database
+client and the state store are created once and reused by every run.
+
+Each source runs every `interval` seconds (Source.interval, else
+SCRAPER_INTERVAL, default 3600) with +/- `jitter` of random spread, so
+sources drift apart instead of all hitting the network at once. Runs are
+one at a time; sources that fall due while a run is in progress are taken
+up once it finishes, never run twice over each other, and a missed slot is
+not made up more than once.
+
+A status file (SCRAPER_STATUS_PATH, default scheduler_status.json next to
+this module) is rewritten after every run and at least once a minute: per
+source the next and last run, its counts and last error, plus the last
+run's report.
+
+    python scheduler.py
+    python scheduler.py --source CalLink --every CalLink=900 --jitter 0.2
+"""
+
+import argparse
+import json
+import os
+import random
+import signal
+import time
+from datetime import datetime
+from threading import Event
+
+from dotenv import load_dotenv
+
+from engine import run
+from metrics import get_metrics, write_atomic
+from sinks import make_sink
+from sources import get_sources
+from state_store import StateStore
+
+# Longest sleep between status file updates
+HEARTBEAT_SECONDS = 60
+
+DEFAULT_STATUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scheduler_status.json')
+
+def default_interval():
+    return float(os.getenv("SCRAPER_INTERVAL", "3600"))
+
+def default_status_path():
+    return os.getenv("SCRAPER_STATUS_PATH", DEFAULT_STATUS_PATH)
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat(timespec='seconds') if timestamp else None
+
+class SourceSchedule:
+    """When one source runs next, and how its last run went"""
+
+    def __init__(self, name, interval):
+        self.name = name
+        self.interval = interval
+        self.next_run = time.time()
+        self.runs = 0
+        self.coalesced = 0
+        self.last_started = None
+        self.last_finished = None
+        self.last_seconds = None
+        self.last_counts = {}
+        self.last_error = None
+
+    def to_dict(self):
+        return {
+            'interval_seconds': self.interval,
+            'next_run_at': _iso(self.next_run),
+            'runs': self.runs,
+            'coalesced_slots': self.coalesced,
+            'last_started_at': _iso(self.last_started),
+            'last_finished_at': _iso(self.last_finished),
+            'last_seconds': self.last_seconds,
+            'last_counts': self.last_counts,
+            'last_error': self.last_error,
+        }
+
+class Scheduler:
+    """
+    Runs registered sources on their intervals until stop() is called.
+
+    names: sources to schedule (default: all registered)
+    intervals: source name -> seconds, overriding Source.interval
+    jitter: fraction of the interval each next run is moved by, at random
+    """
+
+    def __init__(self, names=None, intervals=None, jitter=0.1, modes=None, sink=None,
+                 state=None, status_path=None):
+        intervals = intervals or {}
+        self.schedules = {source.name: SourceSchedule(source.name, intervals.get(source.name)
+                                                      or source.interval or default_interval())
+                          for source in get_sources(names)}
+        self.jitter = jitter
+        self.modes = modes
+        # Created once and kept for every run: the warm part of the process
+        self.sink = sink or make_sink()
+        self.state = state if state is not None else StateStore()
+        self.status_path = status_path or default_status_path()
+        self.started = time.time()
+        self.running = []
+        self.last_report = None
+        self._random = random.Random()
+        self._stop = Event()
+
+    def stop(self, *_):
+        if not self._stop.is_set():
+            print("\n🛑 Stopping after the current run...")
+        self._stop.set()
+
+    def due(self, now):
+        return [name for name, schedule in self.schedules.items() if schedule.next_run <= now]
+
+    def run_due(self, names):
+        """One pipeline run over the due sources, then schedule each one's next run"""
+        started = time.time()
+        self.running = names
+        for name in names:
+            schedule = self.schedules[name]
+            schedule.last_started = started
+            # Slots that passed while an earlier run was still going
+            if schedule.last_finished and started - schedule.next_run > schedule.interval:
+                schedule.coalesced += int((started - schedule.next_run) // schedule.interval)
+        self.write_status()
+
+        print(f"\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} running {', '.join(names)}")
+        stats, error = None, None
+        try:
+            stats = run(names, modes=self.modes, sink=self.sink, state=self.state)
+            self.last_report = get_metrics().report(stats)
+        except Exception as e:
+            error = e
+            print(f"   ❌ Run failed: {e}")
+
+        finished = time.time()
+        for name in names:
+            schedule = self.schedules[name]
+            schedule.runs += 1
+            schedule.last_finished = finished
+            schedule.last_seconds = round(finished - started, 1)
+            if stats is not None:
+                schedule.last_counts = {'scraped': stats.scraped[name], 'new': stats.new[name],
+                                        'changed': stats.changed[name], 'unchanged': stats.unchanged[name]}
+                source_error = stats.source_errors.get(name)
+                schedule.last_error = str(source_error) if source_error else None
+            else:
+                schedule.last_error = str(error)
+            spread = self._random.uniform(-self.jitter, self.jitter) * schedule.interval
+            schedule.next_run = finished + schedule.interval + spread
+        self.running = []
+        self.write_status()
+
+    def write_status(self):
+        status = {
+            'pid': os.getpid(),
+            'started_at': _iso(self.started),
+            'updated_at': _iso(time.time()),
+            'state': 'stopped' if self._stop.is_set() and not self.running else
+                     ('running' if self.running else 'idle'),
+            'running': self.running,
+            'sources': {name: schedule.to_dict() for name, schedule in self.schedules.items()},
+            'last_run': self.last_report,
+        }
+        try:
+            write_atomic(self.status_path, json.dumps(status, indent=2, default=str))
+        except OSError as e:
+            print(f"   ⚠️  Could not write {self.status_path}: {e}")
+
+    def run_forever(self):
+        print(f"🗓️  Scheduling {len(self.schedules)} source(s); status in {self.status_path}")
+        for name, schedule in self.schedules.items():
+            print(f"   - {name}: every {schedule.interval / 60:.0f} min ± {self.jitter:.0%}")
+
+        while not self._stop.is_set():
+            now = time.time()
+            names = self.due(now)
+            if names:
+                self.run_due(names)
+                continue
+            next_run = min(schedule.next_run for schedule in self.schedules.values())
+            self.write_status()
+            self._stop.wait(min(max(next_run - now, 0), HEARTBEAT_SECONDS))
+        self.write_status()
+
+def parse_intervals(pairs):
+    """['CalLink=900', ...] -> {'CalLink': 900.0}"""
+    intervals = {}
+    for pair in pairs or []:
+        name, _, seconds = pair.rpartition('=')
+        if not name:
+            raise ValueError(f"Expected NAME=SECONDS, got {pair!r}")
+        intervals[name] = float(seconds)
+    return intervals
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape each source on its own interval, in one long-running process")
+    parser.add_argument('--source', action='append', help="Source name (repeatable; default: all)")
+    parser.add_argument('--every', action='append', metavar='NAME=SECONDS', help="Interval for one source")
+    parser.add_argument('--jitter', type=float, default=0.1, help="Random spread as a fraction of the interval")
+    parser.add_argument('--mode', help="Comma-separated render modes to allow")
+    parser.add_argument('--sink', help="Sink spec (default: SCRAPER_SINK or supabase)")
+    parser.add_argument('--status', help="Status file (default: SCRAPER_STATUS_PATH or scraper/scheduler_status.json)")
+    args = parser.parse_args()
+
+    # Load environment variables at run time, not on import
+    load_dotenv()
+
+    scheduler = Scheduler(
+        names=args.source,
+        intervals=parse_intervals(args.every),
+        jitter=args.jitter,
+        modes=tuple(m.strip() for m in args.mode.split(',')) if args.mode else None,
+        sink=make_sink(args.sink),
+        status_path=args.status,
+    )
+    signal.signal(signal.SIGTERM, scheduler.stop)
+    signal.signal(signal.SIGINT, scheduler.stop)
+    scheduler.run_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Event Sinks - where the pipeline writes events
+
+Every sink is called with a list of events and returns a truthy result on
+success (a bulk_writer.WriteReport where per-row outcomes are known):
+
+    SupabaseSink  - the events table, through chunked bulk writes (default)
+                    "local" points it at the campus_events.local_postgrest stand-in
+    SQLiteSink    - a local SQLite file, upserted on the fingerprint
+    JsonlSink     - one JSON object per line, appended to a file
+    MemorySink    - a list in memory, for tests and offline benchmarks
+
+make_sink() picks one from SCRAPER_SINK ("supabase", "local[:<path>]",
+"sqlite:<path>", "jsonl:<path>" or "memory"). The Supabase client is only
+created on first use, so importing a scraper needs neither credentials nor a
+network; with SUPABASE_LOCAL set it is the local stand-in instead.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+from campus_events.identity import normalize_start_time
+from campus_events.local_postgrest import client_from_env
+from dotenv import load_dotenv
+
+from bulk_writer import RowOutcome, WriteReport, bulk_write, print_report
+
+# Errors from a table without the fingerprint migration: no unique index to
+# upsert on (42P10), or no fingerprint column at all (PGRST204)
+UNMIGRATED_CODES = {'42P10', 'PGRST204'}
+
+# Rows per request when reading stored keys
+SELECT_PAGE_SIZE = 1000
+
+_supabase = None
+_supabase_lock = threading.Lock()
+
+def get_supabase():
+    """
+    Process-wide Supabase client, created on first call from SUPABASE_URL / SUPABASE_KEY
+    (or a campus_events.local_postgrest stand-in when SUPABASE_LOCAL is set)
+    """
+    global _supabase
+    with _supabase_lock:
+        if _supabase is None:
+            load_dotenv()
+            if os.getenv("SUPABASE_LOCAL"):
+                _supabase = client_from_env()
+            else:
+                from supabase import create_client
+
+                _supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+    return _supabase
+
+class Sink:
+    """Base class: subclasses implement write(events)"""
+
+    def write(self, events):
+        raise NotImplementedError
+
+    def __call__(self, events):
+        return self.write(events)
+
+    def close(self):
+        pass
+
+class SupabaseSink(Sink):
+    """
+    Writes to a Supabase table with bulk_write.
+
+    on_conflict: column to upsert on, or None for plain inserts
+    ignore_duplicates: on a conflict keep the stored row (insert new events
+        only) instead of updating it
+
+    Upserting needs the fingerprint migration (README.md). On a table without
+    it the first upsert fails with 42P10 (no unique index) or PGRST204 (no
+    such column); the sink then switches to inserting only the events whose
+    title and start time are not stored yet, as the scripts did before, and
+    leaves the fingerprint out if the table has no column for it.
+    """
+
+    def __init__(self, table='events', on_conflict='fingerprint', client=None, ignore_duplicates=False):
+        self.table = table
+        self.on_conflict = on_conflict
+        self.ignore_duplicates = ignore_duplicates
+        self.insert_only = False
+        self.has_fingerprint = True
+        self._client = client
+        self._fallback_lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_supabase()
+        return self._client
+
+    def write_chunk(self, chunk):
+        if not self.on_conflict:
+            self.insert(chunk)
+            return
+        if not self.insert_only:
+            try:
+                self.client.table(self.table).upsert(chunk, on_conflict=self.on_conflict,
+                                                     ignore_duplicates=self.ignore_duplicates).execute()
+                return
+            except Exception as e:
+                if getattr(e, 'code', None) not in UNMIGRATED_CODES:
+                    raise
+                with self._fallback_lock:
+                    if not self.insert_only:
+                        self.insert_only = True
+                        print(f"   ⚠️  {self.table} cannot be upserted on {self.on_conflict} ({e}); "
+                              f"inserting new events only until it is migrated (see README.md)")
+        self.insert(self.new_rows(chunk))
+
+    def insert(self, rows):
+        if not rows:
+            return
+        if not self.has_fingerprint:
+            rows = [{k: v for k, v in row.items() if k != 'fingerprint'} for row in rows]
+        try:
+            self.client.table(self.table).insert(rows).execute()
+        except Exception as e:
+            if not (self.has_fingerprint and getattr(e, 'code', None) == 'PGRST204' and 'fingerprint' in str(e)):
+                raise
+            self.has_fingerprint = False
+            self.insert(rows)
+
+    def new_rows(self, rows):
+        """The rows whose (title, start_time) is not in the table yet"""
+        stored = set()
+        table = self.client.table
+        timed = [row['start_time'] for row in rows if row.get('start_time')]
+        if timed:
+            offset = 0
+            while True:
+                page = (table(self.table).select('title,start_time')
+                        .gte('start_time', min(timed)).lte('start_time', max(timed))
+                        .order('start_time').order('id')
+                        .range(offset, offset + SELECT_PAGE_SIZE - 1).execute().data or [])
+                stored.update((r['title'], normalize_start_time(r['start_time'])) for r in page)
+                if len(page) < SELECT_PAGE_SIZE:
+                    break
+                offset += SELECT_PAGE_SIZE
+        untimed = list({row['title'] for row in rows if not row.get('start_time')})
+        if untimed:
+            page = table(self.table).select('title').is_('start_time', 'null').in_('title', untimed).execute().data or []
+            stored.update((r['title'], '') for r in page)
+        return [row for row in rows if (row.get('title'), normalize_start_time(row.get('start_time'))) not in stored]
+
+    def write(self, events):
+        report = bulk_write(events, self.write_chunk, label=self.table)
+        print_report(report, events)
+        return report
+
+class SQLiteSink(Sink):
+    """Keeps events in a local SQLite table, one row per fingerprint (JSON body)"""
+
+    def __init__(self, path):
+        self.path = path
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS events (
+                    fingerprint TEXT PRIMARY KEY,
+                    title TEXT,
+                    start_time TEXT,
+                    source_url TEXT,
+                    data TEXT NOT NULL
+                )
+            """)
+
+    def write_chunk(self, chunk):
+        rows = [(e.get('fingerprint') or f"{e.get('source_url')}|{e.get('title')}", e.get('title'),
+                 e.get('start_time'), e.get('source_url'), json.dumps(e, default=str)) for e in chunk]
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT INTO events (fingerprint, title, start_time, source_url, data) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (fingerprint) DO UPDATE SET title = excluded.title, start_time = excluded.start_time,
+                        source_url = excluded.source_url, data = excluded.data
+                """, rows)
+        finally:
+            conn.close()
+
+    def write(self, events):
+        # One writer at a time; SQLite serializes writes anyway
+        report = bulk_write(events, self.write_chunk, max_workers=1, label='sqlite')
+        print_report(report, events)
+        return report
+
+class JsonlSink(Sink):
+    """Appends events to a JSON Lines file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, events):
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps(event, default=str) + '\n')
+        print(f"✅ Appended {len(events)} events to {self.path}")
+        return _all_written(events)
+
+class MemorySink(Sink):
+    """Collects events in `self.events`"""
+
+    def __init__(self):
+        self.events = []
+        self.flushes = 0
+        self._lock = threading.Lock()
+
+    def write(self, events):
+        with self._lock:
+            self.events.extend(events)
+            self.flushes += 1
+        return _all_written(events)
+
+def _all_written(events):
+    report = WriteReport(len(events))
+    report.outcomes = [RowOutcome(i, True, None) for i in range(len(events))]
+    return report
+
+def make_sink(spec=None, on_conflict='fingerprint', ignore_duplicates=False):
+    """
+    Build a sink from a spec string (default: SCRAPER_SINK, else "supabase").
+
+    on_conflict and ignore_duplicates apply to the Supabase sink (on_conflict
+    None inserts instead of upserting; ignore_duplicates leaves stored rows as they are).
+    """
+    spec = spec or os.getenv("SCRAPER_SINK", "supabase")
+    kind, _, path = spec.partition(':')
+    if kind == 'supabase':
+        return SupabaseSink(on_conflict=on_conflict, ignore_duplicates=ignore_duplicates)
+    if kind == 'local':
+        return SupabaseSink(on_conflict=on_conflict, client=client_from_env(path or None),
+                            ignore_duplicates=ignore_duplicates)
+    if kind == 'sqlite':
+        return SQLiteSink(path or 'events.db')
+    if kind == 'jsonl':
+        return JsonlSink(path or 'events.jsonl')
+    if kind == 'memory':
+        return MemorySink()
+    raise ValueError(f"Unknown sink '{spec}' (use supabase, local[:<path>], sqlite:<path>, jsonl:<path> or memory)")
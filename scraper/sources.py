@@ -0,0 +1,164 @@
+"""
+Source Registry - every site the scrapers read, declared in one place
+
+A Source says where a site's events are and how to pick them out of the
+page; engine.py does the fetching, rendering, extraction and writing for all
+of them. Adding a venue means registering one more Source here:
+
+    register(Source(
+        'Example Hall', 'https://example.org/events',
+        modes=('static', 'browser'),
+        containers=['div.event-card', 'article'],
+        fields={'title': ['h3'], 'start_time': ['time@datetime']},
+        defaults={'location': 'Example Hall, Berkeley'},
+    ))
+
+Render modes, tried in the order a source lists them until one yields events:
+    api      - source.api() returns an iterable of event pages (api_sources.py)
+    static   - listing pages fetched over HTTP and parsed, following pagination
+    browser  - listing rendered in pooled headless Chrome, scrolled / "Load more"-ed
+
+Field selectors are CSS, tried in order until one gives a value:
+    "h3.title"     text of the first match inside the container
+    "time@datetime" an attribute of the first match ("@style" reads a url(...) out of it)
+    "@href"        an attribute of the container itself
+    ""             the container's own text
+"""
+
+from urllib.parse import urlparse
+
+from campus_events.identity import source_slug
+
+from api_sources import CALLINK_API_URL, iter_berkeley_events, iter_callink_events
+
+MODES = ('api', 'static', 'browser')
+
+# Fields every source gets unless it overrides them
+DEFAULT_FIELDS = {
+    'source_url': ['@href', 'a[href]@href'],
+    'image_url': ['img[src]@src', "div[role='img']@style"],
+}
+
+# Selectors shared by the campus listings (cards built by different CMSs)
+CARD_TITLE = ["h2, h3, h4, .title, [class*='title']",
+              ":is(h2, h3, h4, a):is([class*='name' i], [class*='heading' i])",
+              "a[href*='/event' i]",
+              ""]
+CARD_DESCRIPTION = [".description, [class*='description'], [class*='desc' i], [class*='summary' i], p"]
+CARD_LOCATION = ["[class*='location' i], [class*='venue' i], [class*='place' i]"]
+CARD_CLUB = ["[class*='club' i], [class*='organization' i], [class*='group' i]"]
+
+class Source:
+    """
+    One site: where its listing is, how it renders and how to read its cards.
+
+    name: source name used in logs, the state store and fingerprints
+    url: listing page (static / browser modes)
+    modes: render modes to try, in order (see MODES)
+    api: zero-argument function returning an iterable of event pages (api mode)
+    containers: CSS selectors for event cards; the first that matches is used
+    fields: event field -> selectors (see the module docstring); source_url
+        and image_url default to DEFAULT_FIELDS
+    defaults: values for fields a card does not have (location, category, coordinates)
+    required: fields without which a card is dropped
+    ready_endpoint: XHR the page fetches its events from, to wait for in browser mode
+    host_limit: most requests in flight to the source's host (and pages fetched at once)
+    max_pages: most listing pages (or scroll rounds); None for the SCRAPER_MAX_PAGES default
+    interval: seconds between scheduled runs (scheduler.py); None for its default
+    """
+
+    def __init__(self, name, url, modes=('static',), api=None, containers=(), fields=None,
+                 defaults=None, required=('title',), ready_endpoint=None, host_limit=None,
+                 max_pages=None, interval=None):
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise ValueError(f"{name}: unknown render mode(s) {sorted(unknown)}")
+        if 'api' in modes and api is None:
+            raise ValueError(f"{name}: api mode needs an api function")
+        self.name = name
+        self.url = url
+        self.modes = tuple(modes)
+        self.api = api
+        self.containers = list(containers)
+        self.fields = {**DEFAULT_FIELDS, **(fields or {})}
+        self.defaults = dict(defaults or {})
+        self.required = tuple(required)
+        self.ready_endpoint = ready_endpoint
+        self.host_limit = host_limit
+        self.max_pages = max_pages
+        self.interval = interval
+
+    @property
+    def slug(self):
+        """File-name form of the name, e.g. 'greek_theatre'"""
+        return source_slug(self.name)
+
+    def __repr__(self):
+        return f"Source({self.name!r}, {self.url!r}, modes={self.modes})"
+
+REGISTRY = {}
+
+def register(source):
+    """Add a source to the registry (replacing one of the same name)"""
+    REGISTRY[source.name] = source
+    return source
+
+def get_sources(names=None):
+    """Registered sources, all of them or the named ones in the order given"""
+    if not names:
+        return list(REGISTRY.values())
+    missing = [name for name in names if name not in REGISTRY]
+    if missing:
+        raise KeyError(f"Unknown source(s) {missing}; registered: {list(REGISTRY)}")
+    return [REGISTRY[name] for name in names]
+
+register(Source(
+    'CalLink', 'https://callink.berkeley.edu/events',
+    modes=('api', 'static', 'browser'),
+    api=iter_callink_events,
+    # MUI cards, then bare event links (React app; the static page has neither)
+    containers=["div[class*='Card']", "a[href*='/event/']", "div[class*='event' i]", "[data-event]"],
+    fields={
+        'title': CARD_TITLE,
+        'description': CARD_DESCRIPTION,
+        'location': CARD_LOCATION,
+        'club_name': CARD_CLUB,
+    },
+    ready_endpoint=urlparse(CALLINK_API_URL).path,
+))
+
+register(Source(
+    'Berkeley Events', 'https://events.berkeley.edu/',
+    modes=('api', 'static', 'browser'),
+    api=iter_berkeley_events,
+    containers=["div[class*='event' i]", "article[class*='event' i]", "div[class*='card']",
+                "a[href*='/events/']", "[data-event-id]"],
+    fields={
+        'title': CARD_TITLE,
+        'description': CARD_DESCRIPTION,
+        'location': CARD_LOCATION,
+    },
+))
+
+register(Source(
+    'Greek Theatre', 'https://thegreekberkeley.com/event-listing/',
+    modes=('static', 'browser'),
+    containers=['div.mix.detail-information', 'article.event', 'div.event', '.event-item',
+                '.event-card', 'article', 'li.event', '.listing-item',
+                "article[class*='event' i], div[class*='event' i], div[class*='listing' i], div[class*='card' i]"],
+    fields={
+        'title': ['.show-title'],
+        'description': ['.description', '.event-description', 'p', '.excerpt'],
+        'start_time': ['.date-show@content', '.date-show'],
+    },
+    defaults={
+        'category': 'arts',
+        'location': 'The Greek Theatre, Berkeley',
+        'latitude': 37.8733,
+        'longitude': -122.2545,
+    },
+    required=('title', 'start_time'),
+    host_limit=2,
+    # Venue listings change a few times a week
+    interval=6 * 3600,
+))
@@ -0,0 +1,148 @@
+"""
+Scrape State Store - remembers what each source returned on earlier runs
+
+A local SQLite file keeps, per source, every event key with a hash of its
+content and when it was last seen. Each run can then pass on only new or
+changed events, so database writes scale with churn instead of listing size.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+
+from campus_events.identity import event_key
+
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scrape_state.db')
+
+# Fields that change on every run and say nothing about the event itself
+VOLATILE_FIELDS = {'scraped_at', 'fingerprint'}
+
+EventDiff = namedtuple('EventDiff', ['new', 'changed', 'unchanged'])
+
+def content_hash(event):
+    """Hash of everything about the event except volatile fields"""
+    stable = {k: v for k, v in event.items() if k not in VOLATILE_FIELDS}
+    return hashlib.sha1(json.dumps(stable, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+class StateStore:
+    def __init__(self, path=None):
+        self.path = path or os.getenv("SCRAPER_STATE_PATH", DEFAULT_STATE_PATH)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS seen_events (
+                    source TEXT NOT NULL,
+                    event_key TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    first_seen TEXT NOT NULL,
+                    last_seen TEXT NOT NULL,
+                    PRIMARY KEY (source, event_key)
+                );
+                CREATE TABLE IF NOT EXISTS source_watermarks (
+                    source TEXT PRIMARY KEY,
+                    last_seen TEXT NOT NULL,
+                    event_count INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS detail_pages (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    details TEXT NOT NULL,
+                    fetched_at TEXT NOT NULL
+                );
+            """)
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call keeps the store safe to use from worker threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def known_hashes(self, source):
+        """{event key: content hash} of everything recorded for a source"""
+        with self._connect() as conn:
+            return dict(conn.execute(
+                "SELECT event_key, content_hash FROM seen_events WHERE source = ?", (source,)
+            ))
+
+    def diff(self, source, events, known=None):
+        """
+        Split a source's events into new, changed and unchanged against the last run.
+        Pass `known` (from known_hashes) to diff several batches without re-reading it.
+        """
+        known = self.known_hashes(source) if known is None else known
+
+        new, changed, unchanged = [], [], []
+        for event in events:
+            stored = known.get(event_key(source, event))
+            if stored is None:
+                new.append(event)
+            elif stored != content_hash(event):
+                changed.append(event)
+            else:
+                unchanged.append(event)
+        return EventDiff(new, changed, unchanged)
+
+    def record(self, source, events):
+        """Remember events as seen (call after they were written successfully)"""
+        self.record_seen(source, [(event_key(source, e), content_hash(e)) for e in events])
+        self.mark_source(source, len(events))
+
+    def record_seen(self, source, rows):
+        """Remember (event key, content hash) rows as seen now"""
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.executemany("""
+                INSERT INTO seen_events (source, event_key, content_hash, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (source, event_key)
+                DO UPDATE SET content_hash = excluded.content_hash, last_seen = excluded.last_seen
+            """, [(source, key, digest, now, now) for key, digest in rows])
+
+    def mark_source(self, source, event_count):
+        """Move a source's watermark to now after a complete, successfully written run"""
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT INTO source_watermarks (source, last_seen, event_count) VALUES (?, ?, ?)
+                ON CONFLICT (source) DO UPDATE SET last_seen = excluded.last_seen, event_count = excluded.event_count
+            """, (source, datetime.now().isoformat(), event_count))
+
+    def last_seen(self, source):
+        """When the source last completed a recorded run (ISO string), or None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT last_seen FROM source_watermarks WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else None
+
+    def cached_details(self, urls):
+        """{url: {'etag', 'last_modified', 'details'}} for detail pages fetched before"""
+        urls = list(urls)
+        cached = {}
+        with self._connect() as conn:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT url, etag, last_modified, details FROM detail_pages WHERE url IN ({','.join('?' * len(chunk))})",
+                    chunk)
+                for url, etag, last_modified, details in rows:
+                    cached[url] = {'etag': etag, 'last_modified': last_modified, 'details': json.loads(details)}
+        return cached
+
+    def save_details(self, pages):
+        """Store parsed detail pages: {url: {'etag', 'last_modified', 'details'}}"""
+        now = datetime.now().isoformat()
+        rows = [(url, page.get('etag'), page.get('last_modified'), json.dumps(page['details']), now)
+                for url, page in pages.items()]
+        with self._connect() as conn:
+            conn.executemany("""
+                INSERT INTO detail_pages (url, etag, last_modified, details, fetched_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET etag = excluded.etag, last_modified = excluded.last_modified,
+                    details = excluded.details, fetched_at = excluded.fetched_at
+            """, rows)
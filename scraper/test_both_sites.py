@@ -5,38 +5,17 @@ Complete Test - Tests both CalLink and Berkeley Events scraping
 import os
 import time
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import load_dotenv
 
-load_dotenv()
-
-CATEGORY_KEYWORDS = {
-    'work': ['career', 'internship', 'job', 'recruitment', 'hiring', 'interview', 'resume', 
-             'networking', 'professional', 'workshop', 'info session', 'infosession', 'tech talk'],
-    'social': ['social', 'mixer', 'meet and greet', 'happy hour', 'party', 'celebration', 
-               'gathering', 'BBQ', 'dinner', 'lunch', 'food', 'free food'],
-    'sports': ['sport', 'game', 'tournament', 'fitness', 'yoga', 'run', 'basketball', 
-               'soccer', 'volleyball', 'tennis', 'cal bears'],
-    'arts': ['art', 'music', 'concert', 'performance', 'theater', 'dance', 
-             'film', 'movie', 'screening'],
-    'leisure': ['club meeting', 'general meeting', 'study', 'discussion', 'seminar', 
-                'lecture', 'talk', 'presentation']
-}
+from browser_pool import DriverPool
+from categorize import categorize_event
+from driver_cache import start_chrome
 
-def categorize_event(title, description):
-    text = f"{title} {description}".lower()
-    category_scores = {}
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        score = sum(1 for keyword in keywords if keyword in text)
-        if score > 0:
-            category_scores[category] = score
-    return max(category_scores, key=category_scores.get) if category_scores else 'leisure'
+load_dotenv()
 
 def setup_driver():
     chrome_options = Options()
@@ -45,16 +24,17 @@ def setup_driver():
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_argument('--window-size=1920,1080')
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
+    return start_chrome(chrome_options)
+
+# A single Chrome shared by both site tests
+driver_pool = DriverPool(setup_driver, max_size=1)
 
 def test_callink():
     print("\n" + "="*70)
     print("🔍 TESTING CALLINK")
     print("="*70 + "\n")
     
-    driver = setup_driver()
+    driver = driver_pool.acquire()
     events = []
     
     try:
@@ -114,7 +94,7 @@ def test_callink():
         driver.save_screenshot("/tmp/callink_test_error.png")
     
     finally:
-        driver.quit()
+        driver_pool.release(driver)
     
     return events
 
@@ -123,7 +103,7 @@ def test_berkeley_events():
     print("🔍 TESTING BERKELEY EVENTS")
     print("="*70 + "\n")
     
-    driver = setup_driver()
+    driver = driver_pool.acquire()
     events = []
     
     try:
@@ -189,7 +169,7 @@ def test_berkeley_events():
         driver.save_screenshot("/tmp/berkeley_test_error.png")
     
     finally:
-        driver.quit()
+        driver_pool.release(driver)
     
     return events
 
@@ -4,65 +4,20 @@ Now includes image URL extraction!
 """
 
 import os
-import re
 import time
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import load_dotenv
 
-load_dotenv()
-
-CATEGORY_KEYWORDS = {
-    'work': ['career', 'internship', 'job', 'recruitment', 'hiring', 'interview', 'resume', 
-             'networking', 'professional', 'workshop', 'info session', 'infosession', 'tech talk'],
-    'social': ['social', 'mixer', 'meet and greet', 'happy hour', 'party', 'celebration', 
-               'gathering', 'BBQ', 'dinner', 'lunch', 'food', 'free food'],
-    'sports': ['sport', 'game', 'tournament', 'fitness', 'yoga', 'run', 'basketball', 
-               'soccer', 'volleyball', 'tennis', 'cal bears'],
-    'arts': ['art', 'music', 'concert', 'performance', 'theater', 'dance', 
-             'film', 'movie', 'screening'],
-    'leisure': ['club meeting', 'general meeting', 'study', 'discussion', 'seminar', 
-                'lecture', 'talk', 'presentation']
-}
-
-def categorize_event(title, description):
-    text = f"{title} {description}".lower()
-    category_scores = {}
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        score = sum(1 for keyword in keywords if keyword in text)
-        if score > 0:
-            category_scores[category] = score
-    return max(category_scores, key=category_scores.get) if category_scores else 'leisure'
+from browser_pool import DriverPool
+from categorize import categorize_event
+from dom_extract import extract_cards
+from driver_cache import start_chrome
 
-def extract_image_url(element):
-    """Extract image URL from background-image style or img src"""
-    try:
-        # Method 1: Check for div with role="img" and background-image
-        img_divs = element.find_elements(By.CSS_SELECTOR, 'div[role="img"]')
-        for img_div in img_divs:
-            style = img_div.get_attribute('style')
-            if style:
-                # Extract URL from background-image: url('...')
-                url_match = re.search(r'url\(["\']?(https?://[^"\')]+)["\']?\)', style)
-                if url_match:
-                    return url_match.group(1)
-        
-        # Method 2: Check for regular img tags
-        img_tags = element.find_elements(By.TAG_NAME, 'img')
-        for img in img_tags:
-            src = img.get_attribute('src')
-            if src and src.startswith('http'):
-                return src
-        
-        return None
-    except Exception as e:
-        return None
+load_dotenv()
 
 def setup_driver():
     chrome_options = Options()
@@ -71,16 +26,17 @@ def setup_driver():
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_argument('--window-size=1920,1080')
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
+    return start_chrome(chrome_options)
+
+# A single Chrome shared by both site tests
+driver_pool = DriverPool(setup_driver, max_size=1)
 
 def test_callink():
     print("\n" + "="*70)
     print("🔍 TESTING CALLINK (with images)")
     print("="*70 + "\n")
     
-    driver = setup_driver()
+    driver = driver_pool.acquire()
     events = []
     
     try:
@@ -90,33 +46,25 @@ def test_callink():
         wait = WebDriverWait(driver, 20)
         wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div[class*='Card']")))
         
-        event_elements = driver.find_elements(By.CSS_SELECTOR, "div[class*='Card']")
-        print(f"✅ Found {len(event_elements)} event cards\n")
+        # Title, link, image and text of every card in one script call
+        cards = extract_cards(driver, "div[class*='Card']", title_selector="h2, h3, h4",
+                              description_selector=None, limit=10)
+        print(f"✅ Found {len(cards)} event cards\n")
         
-        for i, element in enumerate(event_elements[:10], 1):
+        for i, card in enumerate(cards, 1):
             try:
                 # Get title
-                title = None
-                try:
-                    title_element = element.find_element(By.CSS_SELECTOR, "h2, h3, h4")
-                    title = title_element.text.strip()
-                except:
-                    text_lines = element.text.strip().split('\n')
+                title = card['title']
+                if title is None:
+                    text_lines = card['text'].split('\n')
                     title = text_lines[0] if text_lines else ""
                 
-                # Get URL
-                url = "https://callink.berkeley.edu/events"
-                try:
-                    link = element.find_element(By.TAG_NAME, 'a')
-                    url = link.get_attribute('href')
-                except:
-                    pass
-                
-                # Get image URL
-                image_url = extract_image_url(element)
+                # Get URL and image URL
+                url = card['url'] or "https://callink.berkeley.edu/events"
+                image_url = card['image_url']
                 
                 # Get description
-                description = element.text.strip()
+                description = card['text']
                 
                 if title and len(title) > 3:
                     category = categorize_event(title, description)
@@ -150,7 +98,7 @@ def test_callink():
         driver.save_screenshot("/tmp/callink_test_error.png")
     
     finally:
-        driver.quit()
+        driver_pool.release(driver)
     
     return events
 
@@ -159,7 +107,7 @@ def test_berkeley_events():
     print("🔍 TESTING BERKELEY EVENTS (with images)")
     print("="*70 + "\n")
     
-    driver = setup_driver()
+    driver = driver_pool.acquire()
     events = []
     
     try:
@@ -169,39 +117,29 @@ def test_berkeley_events():
         wait = WebDriverWait(driver, 20)
         wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div[class*='event']")))
         
-        event_elements = driver.find_elements(By.CSS_SELECTOR, "div[class*='event']")
-        print(f"✅ Found {len(event_elements)} event divs\n")
+        # Title, link, image and text of every card in one script call
+        cards = extract_cards(driver, "div[class*='event']", title_selector="h2, h3, h4, a",
+                              description_selector=None, limit=15)
+        print(f"✅ Found {len(cards)} event divs\n")
         
-        for i, element in enumerate(event_elements[:15], 1):
+        for i, card in enumerate(cards, 1):
             try:
                 # Get title
-                title = None
-                try:
-                    title_element = element.find_element(By.CSS_SELECTOR, "h2, h3, h4, a")
-                    title = title_element.text.strip()
-                except:
-                    text_lines = element.text.strip().split('\n')
+                title = card['title']
+                if title is None:
+                    text_lines = card['text'].split('\n')
                     # Find the longest line that's not a date
                     for line in text_lines:
                         if len(line) > 10 and not line.startswith('DEC') and not line.startswith('Time:'):
                             title = line
                             break
                 
-                # Get URL
-                url = "https://events.berkeley.edu/"
-                try:
-                    link = element.find_element(By.TAG_NAME, 'a')
-                    url = link.get_attribute('href')
-                    if url and not url.startswith('http'):
-                        url = f"https://events.berkeley.edu{url}"
-                except:
-                    pass
-                
-                # Get image URL
-                image_url = extract_image_url(element)
+                # Get URL and image URL
+                url = card['url'] or "https://events.berkeley.edu/"
+                image_url = card['image_url']
                 
                 # Get description
-                description = element.text.strip()
+                description = card['text']
                 
                 if title and len(title) > 3:
                     category = categorize_event(title, description)
@@ -235,7 +173,7 @@ def test_berkeley_events():
         driver.save_screenshot("/tmp/berkeley_test_error.png")
     
     finally:
-        driver.quit()
+        driver_pool.release(driver)
     
     return events
 
@@ -5,15 +5,14 @@ Quick CalLink Test - Verifies scraping works before full run
 import os
 import time
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import load_dotenv
 
+from driver_cache import start_chrome
+
 load_dotenv()
 
 def setup_driver():
@@ -23,9 +22,7 @@ def setup_driver():
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_argument('--window-size=1920,1080')
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
+    return start_chrome(chrome_options)
 
 def test_callink():
     print("\n" + "="*60)
@@ -81,18 +81,16 @@ except Exception as e:
 # Test 5: Chrome/Chromium
 print("\n5️⃣ Checking Chrome/Chromium...")
 try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.service import Service
-    from webdriver_manager.chrome import ChromeDriverManager
     from selenium.webdriver.chrome.options import Options
+    from driver_cache import start_chrome
     
     chrome_options = Options()
     chrome_options.add_argument('--headless')
     chrome_options.add_argument('--no-sandbox')
     chrome_options.add_argument('--disable-dev-shm-usage')
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    # Also fills the chromedriver cache so the scrapers start without resolving it
+    driver = start_chrome(chrome_options)
     driver.quit()
     
     print("   ✅ Chrome and ChromeDriver working")
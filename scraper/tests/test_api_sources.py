@@ -0,0 +1,135 @@
+"""
+Offline tests for the CalLink and Berkeley Events feed adapters
+
+Replays the recorded responses in ../fixtures/api through Fetcher, so no
+network is needed.
+"""
+
+import os
+import re
+from datetime import date, datetime, timedelta
+
+import api_sources
+from api_sources import (BERKELEY_ICAL_URL, LOCAL_TZ, Fetcher, fetch_berkeley_events, fetch_callink_events,
+                         map_callink_event, map_livewhale_event, parse_ical_events)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'api')
+
+def replay():
+    return Fetcher(fixture_dir=FIXTURE_DIR)
+
+def by_title(events):
+    return {event['title']: event for event in events}
+
+def test_callink_events_map_every_field():
+    events = by_title(fetch_callink_events(replay(), ends_after='2026-10-17T00:00:00+00:00'))
+
+    # "GBM" is too short to be a usable title
+    assert set(events) == {'Fall Backpacking Trip Info Session', 'Intro to Machine Learning Workshop'}
+
+    trip = events['Fall Backpacking Trip Info Session']
+    assert trip['description'] == 'Learn about our fall trips & what gear to bring.'
+    assert trip['location'] == '155 Dwinelle Hall'
+    # UTC in the API, campus wall time in the table
+    assert trip['start_time'] == '2026-10-20 18:30:00'
+    assert trip['end_time'] == '2026-10-20 20:00:00'
+    assert trip['source_url'] == 'https://callink.berkeley.edu/event/10412876'
+    assert trip['image_url'] == ('https://se-images.campuslabs.com/clink/images/'
+                                 '7c1e2f4a-3b5d-4e6f-8a9b-0c1d2e3f4a5b.png?preset=med-w')
+    assert trip['club_name'] == 'Cal Hiking and Outdoor Society'
+    assert trip['category'] is None
+
+    workshop = events['Intro to Machine Learning Workshop']
+    assert workshop['description'] is None
+    assert workshop['location'] == 'Berkeley, CA'
+    assert workshop['image_url'] is None
+    # After the switch back to standard time
+    assert workshop['start_time'] == '2026-11-04 18:00:00'
+
+def test_map_callink_event_skips_short_titles():
+    assert map_callink_event({'id': '1', 'name': ' Mtg '}) is None
+
+def test_livewhale_events_map_every_field():
+    events = by_title(fetch_berkeley_events(replay(), days=api_sources.BERKELEY_WINDOW_DAYS))
+
+    assert set(events) == {'Physics Colloquium: Mapping Dark Matter', 'Botanical Garden Fall Plant Sale'}
+
+    colloquium = events['Physics Colloquium: Mapping Dark Matter']
+    assert colloquium['description'] == 'Weekly colloquium of the Department of Physics .'
+    assert colloquium['location'] == '1 LeConte Hall'
+    assert colloquium['start_time'] == '2026-10-22 16:00:00'
+    assert colloquium['end_time'] == '2026-10-22 17:00:00'
+    assert colloquium['source_url'] == 'https://events.berkeley.edu/events/event/181234-physics-colloquium'
+    assert colloquium['image_url'].endswith('/181234.jpg')
+    assert colloquium['club_name'] == 'Department of Physics'
+
+    # Without a description the summary is used, without a location the campus
+    sale = events['Botanical Garden Fall Plant Sale']
+    assert sale['description'] == 'Hundreds of plants grown at the Garden.'
+    assert sale['location'] == 'Berkeley, CA'
+    assert sale['end_time'] is None
+    assert sale['image_url'] is None
+
+def test_map_livewhale_event_skips_short_titles():
+    assert map_livewhale_event({'title': '<b>TBA</b>'}) is None
+
+def test_ical_events_are_parsed():
+    fetcher = replay()
+    events = by_title(parse_ical_events(fetcher.get_text(BERKELEY_ICAL_URL)))
+
+    assert set(events) == {'Noon Concert Series: Gamelan Sekar Jaya',
+                           'Career Fair: Engineering & Computer Science', 'Homecoming Weekend'}
+
+    concert = events['Noon Concert Series: Gamelan Sekar Jaya']
+    # Folded lines are joined and escaped commas unescaped
+    assert concert['description'] == ("Free lunchtime concert of Balinese gamelan music performed by "
+                                      "the Bay Area's own Gamelan Sekar Jaya.")
+    assert concert['location'] == 'Hertz Hall, Room 125'
+    assert concert['start_time'] == '2026-10-23 12:00:00'
+    assert concert['end_time'] == '2026-10-23 13:00:00'
+    assert concert['source_url'] == 'https://events.berkeley.edu/events/event/181402-noon-concert'
+
+    fair = events['Career Fair: Engineering & Computer Science']
+    assert fair['start_time'] == '2026-10-24 10:00:00'
+    assert fair['end_time'] == '2026-10-24 16:00:00'
+
+    homecoming = events['Homecoming Weekend']
+    assert homecoming['start_time'] == '2026-10-30 00:00:00'
+    assert homecoming['location'] == 'Berkeley, CA'
+    assert homecoming['source_url'] == 'https://events.berkeley.edu/'
+
+def test_berkeley_falls_back_to_ical_when_no_window_can_be_read():
+    # No recording exists for a window starting next year, so every JSON request fails
+    start = datetime.now(LOCAL_TZ).date() + timedelta(days=365)
+    events = fetch_berkeley_events(replay(), start=start, days=api_sources.BERKELEY_WINDOW_DAYS)
+
+    assert len(events) == 3
+    assert 'Homecoming Weekend' in by_title(events)
+
+class WindowFetcher:
+    """LiveWhale stand-in: returns the events inside a URL's date window, cut off at the page size"""
+
+    def __init__(self, start, days):
+        self.start = start
+        self.days = days
+        self.requested = []
+
+    def get_json(self, url):
+        first, until = (date.fromisoformat(d) for d in re.findall(r'\d{4}-\d{2}-\d{2}', url))
+        self.requested.append((first, until))
+        records = [{'title': f"Lecture on day {day}", 'url': f"https://events.berkeley.edu/event/{day}",
+                    'date_iso': f"{self.start + timedelta(days=day)}T12:00:00-07:00"}
+                   for day in self.days if first <= self.start + timedelta(days=day) <= until]
+        return records[:int(re.search(r'/max/(\d+)/', url).group(1))]
+
+def test_full_berkeley_window_is_split(monkeypatch):
+    monkeypatch.setattr(api_sources, 'BERKELEY_PAGE_SIZE', 4)
+    start = date(2026, 10, 5)
+    fetcher = WindowFetcher(start, days=[0, 1, 2, 9, 10])
+
+    events = fetch_berkeley_events(fetcher, start=start, days=14)
+
+    # The first window came back full (4 of 5 events), so it was read again in halves
+    assert sorted(event['title'] for event in events) == sorted(f"Lecture on day {day}" for day in (0, 1, 2, 9, 10))
+    assert fetcher.requested[0] == (start, date(2026, 10, 18))
+    assert sorted(fetcher.requested[1:]) == [(start, date(2026, 10, 11)), (date(2026, 10, 12), date(2026, 10, 18))]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Greek Theatre listing parser on saved pages.
+
+Compares the original path (html.parser + selector cascade compiled on
+every call) against the current one (lxml + precompiled selector plan).
+
+Usage:
+    python bench_parse.py saved_listing.html [more.html ...] [--repeat 20]
+
+Save a listing page with e.g. `curl -A Mozilla -o listing.html <EVENT_URL>`.
+"""
+
+import argparse
+import contextlib
+import io
+import re
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, List
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from scraper import EVENT_URL, HTML_PARSER, extract_event_data
+
+LEGACY_SELECTORS = [
+    'div.mix.detail-information',
+    'article.event',
+    'div.event',
+    '.event-item',
+    '.event-card',
+    'article',
+    'li.event',
+    '.listing-item',
+]
+
+
+def legacy_parse(html: bytes) -> int:
+    """The parse path before the compiled plan: html.parser and ad-hoc selectors."""
+    soup = BeautifulSoup(html, 'html.parser')
+    event_elements = []
+    for selector in LEGACY_SELECTORS:
+        event_elements = soup.select(selector)
+        if event_elements:
+            break
+    if not event_elements:
+        event_elements = soup.find_all(['article', 'div'], class_=re.compile(r'event|listing|card', re.I))
+
+    count = 0
+    for element in event_elements:
+        title_elem = element.select_one('.show-title, h2.show-title')
+        if not title_elem or not title_elem.get_text(strip=True):
+            continue
+        for sel in ['.description', '.event-description', 'p', '.excerpt']:
+            desc_elem = element.select_one(sel)
+            if desc_elem and desc_elem.get_text(strip=True):
+                break
+        date_elem = element.select_one('.date-show')
+        if date_elem and date_elem.get('content'):
+            try:
+                datetime.strptime(date_elem['content'], "%B %d, %Y %I:%M %p")
+            except ValueError:
+                pass
+        link_elem = element.find('a', href=True)
+        if link_elem:
+            urljoin(EVENT_URL, link_elem['href'])
+        img_elem = element.find('img', src=True)
+        if img_elem:
+            urljoin(EVENT_URL, img_elem['src'])
+        count += 1
+    return count
+
+
+def current_parse(html: bytes) -> int:
+    """The current parse path: lxml and the precompiled selector plan."""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    return len(extract_event_data(soup, EVENT_URL))
+
+
+def time_parser(parse: Callable[[bytes], int], html: bytes, repeat: int) -> List[float]:
+    """Run `parse` `repeat` times with its console output suppressed; return seconds per run."""
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            parse(html)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pages', nargs='+', help='Saved listing HTML files')
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per parser per page')
+    args = parser.parse_args()
+
+    print(f"{'page':30} {'legacy ms':>10} {'current ms':>11} {'speedup':>8}")
+    print("-" * 62)
+    for path in args.pages:
+        with open(path, 'rb') as f:
+            html = f.read()
+
+        legacy = statistics.median(time_parser(legacy_parse, html, args.repeat))
+        current = statistics.median(time_parser(current_parse, html, args.repeat))
+        print(f"{path[-30:]:30} {legacy * 1000:10.2f} {current * 1000:11.2f} {legacy / current:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Shared headless Chromium for the Playwright code paths.
+Launches the browser once and hands out an isolated context per scrape.
+"""
+
+import atexit
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class BrowserPool:
+    """
+    Lazily started Chromium that is reused across scrapes.
+
+    Each call to `page()` gets a fresh browser context (own cookies, cache and
+    storage), which is much cheaper than launching a new browser process.
+    The Playwright sync API is single-threaded, so use one pool per thread.
+    """
+
+    def __init__(self, headless: bool = True):
+        self.headless = headless
+        self._playwright = None
+        self._browser = None
+        atexit.register(self.close)
+
+    def _ensure_browser(self):
+        """Start Playwright and Chromium on first use, or again if the browser died."""
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+
+        from playwright.sync_api import sync_playwright
+
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        print("Launching pooled Chromium...")
+        self._browser = self._playwright.chromium.launch(headless=self.headless)
+        return self._browser
+
+    @contextmanager
+    def page(self, **context_options) -> Iterator:
+        """
+        Open a page in a new isolated browser context.
+
+        Args:
+            **context_options: Passed to `browser.new_context` (user_agent, viewport, ...)
+
+        Yields:
+            Playwright Page, closed together with its context on exit
+        """
+        context = self._ensure_browser().new_context(**context_options)
+        try:
+            yield context.new_page()
+        finally:
+            context.close()
+
+    def close(self) -> None:
+        """Close the browser and stop Playwright."""
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide browser pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+HTTP validator cache for listing pages.
+Remembers ETag / Last-Modified and a body hash per URL so unchanged pages
+can be detected with a conditional request and skipped.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+import requests
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.http_cache.json')
+
+
+class HttpCache:
+    """
+    Per-URL ETag, Last-Modified and SHA-256 body hash, persisted as JSON.
+
+    Entries recorded with `update()` are only written by `save()`, so callers
+    can persist them after the page's events have been stored successfully.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._entries: Optional[Dict[str, Dict]] = None
+
+    @property
+    def entries(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def has(self, url: str) -> bool:
+        """Return True if the URL has been fetched and stored before."""
+        return url in self.entries
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a URL."""
+        entry = self.entries.get(url, {})
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_unchanged(self, url: str, response: requests.Response) -> bool:
+        """
+        Check whether a response matches what was stored for the URL.
+
+        Returns:
+            True on a 304, or a 200 whose body hash matches the stored one
+        """
+        if response.status_code == 304:
+            return True
+        entry = self.entries.get(url)
+        return bool(entry) and response.ok and entry.get('sha256') == _body_hash(response)
+
+    def update(self, url: str, response: requests.Response) -> None:
+        """Record a response's validators and body hash (written by `save()`)."""
+        self.entries[url] = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'sha256': _body_hash(response),
+        }
+
+    def save(self) -> None:
+        """Write the cache to disk."""
+        if self._entries is None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def _body_hash(response: requests.Response) -> str:
+    return hashlib.sha256(response.content).hexdigest()